@@ -5,25 +5,35 @@ Production-ready Streamlit application for generic data analytics
 
 import streamlit as st
 import polars as pl
+import polars.selectors as cs
+import hashlib
+import io
 import sys
 import os
+from typing import Dict, Any
 
-# Add current directory to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Add current directory to path when run as a script (streamlit run app.py)
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+if __name__ == "__main__" and __package__ is None and APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
 
-from config import COLORS, COLUMN_MAPPING
+from config import COLUMN_MAPPING
 from utils.pii_redactor import PIIRedactor
-from utils.data_processor import DataProcessor
-from assets.icons import get_icon, icon_html, section_header, metric_card
-from modules.executive_dashboard import render_executive_dashboard
-from modules.time_intelligence import render_time_intelligence
-from modules.sky_partner_analysis import render_sky_partner_analysis
-from modules.regional_deep_dive import render_regional_deep_dive
-from modules.root_cause_analysis import render_root_cause_analysis
-from modules.recommendations import render_recommendations
-from modules.recommendations import render_recommendations
-from modules.text_analytics_module import render_text_analytics
-from modules.generic_analysis import render_generic_analysis
+from utils.data_processor import DataProcessor, optimize_dtypes
+from assets.icons import ICON_SPRITE, get_icon, icon_html, metric_card, metric_grid
+import modules
+
+
+# Paramount views: label -> render function, resolved lazily from modules
+PARAMOUNT_VIEWS = {
+    "Executive": "render_executive_dashboard",
+    "Trends": "render_time_intelligence",
+    "Sky Partners": "render_sky_partner_analysis",
+    "Regional": "render_regional_deep_dive",
+    "Root Cause": "render_root_cause_analysis",
+    "Actions": "render_recommendations",
+    "Text Analysis": "render_text_analytics"
+}
 
 
 # Page configuration
@@ -35,209 +45,150 @@ st.set_page_config(
 )
 
 # Professional CSS with muted colors
-st.markdown("""
-<style>
-    /* Import Google Font */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-    
-    /* Root variables - Professional muted palette */
-    :root {
-        --primary: #2563eb;
-        --primary-dark: #1d4ed8;
-        --secondary: #64748b;
-        --success: #059669;
-        --warning: #d97706;
-        --danger: #dc2626;
-        --text-primary: #1e293b;
-        --text-secondary: #475569;
-        --text-muted: #64748b;
-        --bg-primary: #ffffff;
-        --bg-secondary: #f8fafc;
-        --bg-tertiary: #f1f5f9;
-        --border: #e2e8f0;
-    }
-    
-    /* Global font */
-    html, body, [class*="css"] {
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-    }
-    
-    /* Main container */
-    .main .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-        max-width: 1400px;
-    }
-    
-    /* Headers */
-    h1 {
-        font-size: 1.875rem !important;
-        font-weight: 700 !important;
-        color: var(--text-primary) !important;
-        letter-spacing: -0.025em;
-    }
-    
-    h2 {
-        font-size: 1.375rem !important;
-        font-weight: 600 !important;
-        color: var(--text-primary) !important;
-        letter-spacing: -0.025em;
-        margin-top: 1.5rem !important;
-    }
-    
-    h3 {
-        font-size: 1.125rem !important;
-        font-weight: 600 !important;
-        color: var(--text-primary) !important;
-    }
-    
-    /* Sidebar styling */
-    section[data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #1e293b 0%, #0f172a 100%);
-    }
-    
-    section[data-testid="stSidebar"] h1,
-    section[data-testid="stSidebar"] h2,
-    section[data-testid="stSidebar"] h3,
-    section[data-testid="stSidebar"] p,
-    section[data-testid="stSidebar"] span,
-    section[data-testid="stSidebar"] label {
-        color: #e2e8f0 !important;
-    }
-    
-    section[data-testid="stSidebar"] .stCaption {
-        color: #94a3b8 !important;
-    }
-    
-    section[data-testid="stSidebar"] hr {
-        border-color: #334155;
-    }
-    
-    section[data-testid="stSidebar"] [data-testid="stMetricValue"] {
-        color: #f1f5f9 !important;
-    }
-    
-    section[data-testid="stSidebar"] [data-testid="stMetricLabel"] {
-        color: #94a3b8 !important;
-    }
-    
-    /* Tabs */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 0;
-        background: var(--bg-tertiary);
-        border-radius: 10px;
-        padding: 4px;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        padding: 0.625rem 1.25rem;
-        background: transparent;
-        border-radius: 8px;
-        font-weight: 500;
-        font-size: 0.875rem;
-        color: var(--text-secondary);
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background: var(--bg-primary) !important;
-        color: var(--primary) !important;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.08);
-    }
-    
-    /* Metrics */
-    [data-testid="stMetricValue"] {
-        font-size: 1.75rem !important;
-        font-weight: 700 !important;
-        color: var(--text-primary) !important;
-    }
-    
-    [data-testid="stMetricLabel"] {
-        font-size: 0.75rem !important;
-        font-weight: 500 !important;
-        color: var(--text-muted) !important;
-        text-transform: uppercase;
-        letter-spacing: 0.05em;
-    }
-    
-    /* Expanders */
-    .streamlit-expanderHeader {
-        font-weight: 600 !important;
-        font-size: 0.9375rem !important;
-        background: var(--bg-secondary);
-        border-radius: 8px;
-        padding: 0.875rem 1rem !important;
-    }
-    
-    .streamlit-expanderContent {
-        border: 1px solid var(--border);
-        border-top: none;
-        border-radius: 0 0 8px 8px;
-        padding: 1rem;
-    }
-    
-    /* Alert boxes */
-    .stAlert {
-        border-radius: 8px;
-        border: none;
-    }
-    
-    /* Dataframes */
-    .stDataFrame {
-        border: 1px solid var(--border);
-        border-radius: 8px;
-        overflow: hidden;
-    }
-    
-    /* File uploader */
-    section[data-testid="stSidebar"] [data-testid="stFileUploader"] {
-        border: 2px dashed #475569;
-        border-radius: 8px;
-        padding: 1rem;
-        background: rgba(255,255,255,0.05);
-    }
-    
-    section[data-testid="stSidebar"] [data-testid="stFileUploader"]:hover {
-        border-color: var(--primary);
-        background: rgba(37,99,235,0.1);
-    }
-    
-    /* Dividers */
-    hr {
-        border: none;
-        border-top: 1px solid var(--border);
-        margin: 1.5rem 0;
-    }
-    
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-</style>
-""", unsafe_allow_html=True)
+@st.cache_data(show_spinner=False)
+def load_css() -> str:
+    """Read the app stylesheet once per process."""
+    with open(os.path.join(APP_DIR, 'assets', 'app.css'), encoding='utf-8') as f:
+        return f.read()
+
+
+# Stylesheet and icon sprite share one element; get_icon output references the sprite
+st.markdown(f"<style>\n{load_css()}</style>{ICON_SPRITE}", unsafe_allow_html=True)
 
 
-def load_data(uploaded_file) -> pl.DataFrame:
-    """Load data from uploaded file."""
+# Frames are cached as shared resources: Polars frames are immutable, and
+# cache_data would keep a pickled second copy and unpickle a third on every hit
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _parse_upload(filename: str, df_key: str, _buffer: io.BytesIO) -> pl.DataFrame:
+    """Parse an uploaded file buffer. Cached on the content hash so identical uploads skip parsing."""
+    # Polars reads a BytesIO in place; going through bytes would copy the whole upload
+    _buffer.seek(0)
+    if filename.endswith('.csv'):
+        df = pl.read_csv(_buffer, infer_schema_length=10000)
+    elif filename.endswith('.xlsx') or filename.endswith('.xls'):
+        df = pl.read_excel(_buffer)
+    else:
+        df = pl.read_parquet(_buffer)
+    
+    # Encode the columns every view groups on, even past the generic cardinality cutoff
+    processor = DataProcessor(df)
+    dimensions = tuple(filter(None, (
+        processor.get_column(name) for name in ('country', 'category', 'subcategory', 'partner')
+    )))
+    return optimize_dtypes(df, dimension_columns=dimensions)
+
+
+def load_data(uploaded_file, df_key: str) -> pl.DataFrame:
+    """
+    Load data from uploaded file.
+    
+    Returns an eager DataFrame on purpose: every view indexes columns, iterates
+    rows or hands frames to Plotly, so a LazyFrame would be collected again on
+    each rerun. Streamlit already holds the whole upload in memory, so the
+    file is parsed eagerly from that buffer and cached on its content hash.
+    """
     filename = uploaded_file.name.lower()
     
+    if not filename.endswith(('.csv', '.xlsx', '.xls', '.parquet')):
+        st.error(f"Unsupported file format: {filename}")
+        return None
+    
     try:
-        if filename.endswith('.csv'):
-            return pl.read_csv(uploaded_file, infer_schema_length=10000)
-        elif filename.endswith('.xlsx') or filename.endswith('.xls'):
-            return pl.read_excel(uploaded_file)
-        elif filename.endswith('.parquet'):
-            return pl.read_parquet(uploaded_file)
-        else:
-            st.error(f"Unsupported file format: {filename}")
-            return None
+        return _parse_upload(filename, df_key, uploaded_file)
     except Exception as e:
         st.error(f"Error loading file: {str(e)}")
         return None
 
 
+# Regex patterns are compiled on the class; one shared instance is enough
+REDACTOR = PIIRedactor()
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def redact_data(_df: pl.DataFrame, df_key: str, columns: tuple) -> pl.DataFrame:
+    """Redact PII once per uploaded content and column set."""
+    return REDACTOR.redact_dataframe(_df, list(columns))
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def get_processor(_df: pl.DataFrame, df_key: str) -> DataProcessor:
+    """Get a shared DataProcessor for the frame identified by df_key."""
+    return DataProcessor(_df)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def compute_paramount_kpis(_df: pl.DataFrame, df_key: str) -> Dict[str, Any]:
+    """Compute the Paramount KPI row once per frame."""
+    processor = get_processor(_df, df_key)
+    country_col = processor.get_column('country')
+    
+    return {
+        'total_rows': len(_df),
+        # Memoised on the shared processor, which the regional view reuses
+        'markets': processor.get_cardinality(country_col) if country_col else 0,
+        'sky_pct': processor.get_sky_partner_percentage(),
+        'memory_mb': round(_df.estimated_size("mb"), 2)
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def compute_generic_kpis(_df: pl.DataFrame, df_key: str) -> Dict[str, Any]:
+    """Compute the Analysis for All KPI row once per frame."""
+    return {
+        'total_rows': len(_df),
+        'total_columns': len(_df.columns),
+        'numeric_cols': _df.select(cs.numeric()).width,
+        'memory_mb': _df.estimated_size("mb")
+    }
+
+
+@st.cache_data(show_spinner=False)
+def data_structure_card() -> str:
+    """Build the expected data structure card for the empty state."""
+    return f'''
+<div style="background:#f8fafc;border:1px solid #e2e8f0;border-radius:10px;padding:1.25rem">
+<div style="display:flex;align-items:center;gap:8px;margin-bottom:0.75rem">
+{get_icon('file_text', 20, '#2563eb')}
+<span style="font-weight:600;color:#1e293b">Expected Data Structure</span>
+</div>
+<table style="width:100%;font-size:0.875rem;color:#475569">
+<tr><td style="padding:4px 0;border-bottom:1px solid #e2e8f0"><b>Col A</b></td><td>Queue Name</td></tr>
+<tr><td style="padding:4px 0;border-bottom:1px solid #e2e8f0"><b>Col J</b></td><td>Date/Time</td></tr>
+<tr><td style="padding:4px 0;border-bottom:1px solid #e2e8f0"><b>Col M</b></td><td>Description</td></tr>
+<tr><td style="padding:4px 0;border-bottom:1px solid #e2e8f0"><b>Col S</b></td><td>Partner</td></tr>
+<tr><td style="padding:4px 0;border-bottom:1px solid #e2e8f0"><b>Col U</b></td><td>Country</td></tr>
+<tr><td style="padding:4px 0"><b>Col V</b></td><td>Translation</td></tr>
+</table>
+</div>
+'''
+
+
+@st.cache_data(show_spinner=False)
+def features_card() -> str:
+    """Build the features card for the empty state."""
+    return f'''
+<div style="background:#f8fafc;border:1px solid #e2e8f0;border-radius:10px;padding:1.25rem">
+<div style="display:flex;align-items:center;gap:8px;margin-bottom:0.75rem">
+{get_icon('zap', 20, '#2563eb')}
+<span style="font-weight:600;color:#1e293b">Features</span>
+</div>
+<ul style="margin:0;padding-left:1.25rem;font-size:0.875rem;color:#475569;line-height:1.8">
+<li>GDPR-compliant PII redaction</li>
+<li>7 analytics modules</li>
+<li>Automated regional insights</li>
+<li>Optimized for 50K+ rows</li>
+<li>Executive-ready outputs</li>
+</ul>
+</div>
+'''
+
+
 def main():
     """Main application entry point."""
     
+    # Process-wide string cache so categoricals from different frames share one mapping
+    pl.enable_string_cache()
+    
     # Initialize session state
     if 'data' not in st.session_state:
         st.session_state.data = None
@@ -245,6 +196,10 @@ def main():
         st.session_state.pii_redacted = False
     if 'filename' not in st.session_state:
         st.session_state.filename = None
+    if 'df_key' not in st.session_state:
+        st.session_state.df_key = None
+    if 'mem_mb' not in st.session_state:
+        st.session_state.mem_mb = 0.0
     
     # Sidebar
     with st.sidebar:
@@ -286,49 +241,55 @@ def main():
         if uploaded_file:
             if st.session_state.filename != uploaded_file.name:
                 with st.spinner("Loading..."):
-                    df = load_data(uploaded_file)
+                    # getbuffer() is a zero-copy view of the upload
+                    df_key = hashlib.sha256(uploaded_file.getbuffer()).hexdigest()
+                    df = load_data(uploaded_file, df_key)
                     if df is not None:
                         st.session_state.data = df
                         st.session_state.filename = uploaded_file.name
+                        st.session_state.df_key = df_key
+                        st.session_state.mem_mb = df.estimated_size("mb")
                         st.session_state.pii_redacted = False
                         st.success(f"Loaded {len(df):,} rows")
         
-        st.divider()
-        
-        # Privacy section
-        st.markdown(f'{icon_html("shield", 18, "#94a3b8")} **Privacy**', unsafe_allow_html=True)
-        
-        enable_pii = st.checkbox(
-            "Enable PII Redaction",
-            value=True,
-            help="GDPR-compliant redaction"
-        )
-        
-        if enable_pii and st.session_state.data is not None and not st.session_state.pii_redacted:
-            with st.spinner("Redacting..."):
-                try:
-                    redactor = PIIRedactor()
-                    columns = st.session_state.data.columns
-                    
-                    desc_cols = []
-                    if COLUMN_MAPPING['description'] < len(columns):
-                        desc_cols.append(columns[COLUMN_MAPPING['description']])
-                    if COLUMN_MAPPING['description_translated'] < len(columns):
-                        desc_cols.append(columns[COLUMN_MAPPING['description_translated']])
-                    
-                    if desc_cols:
-                        st.session_state.data = redactor.redact_dataframe(
-                            st.session_state.data, desc_cols
-                        )
-                        st.session_state.pii_redacted = True
-                        st.success("PII redacted")
-                except Exception as e:
-                    st.warning(f"Warning: {str(e)}")
-        
-        st.divider()
-        
-        # Data summary
+        # Privacy and summary only apply once data is loaded
         if st.session_state.data is not None:
+            st.divider()
+            
+            # Privacy section
+            st.markdown(f'{icon_html("shield", 18, "#94a3b8")} **Privacy**', unsafe_allow_html=True)
+            
+            enable_pii = st.checkbox(
+                "Enable PII Redaction",
+                value=True,
+                help="GDPR-compliant redaction"
+            )
+            
+            if enable_pii and not st.session_state.pii_redacted:
+                with st.spinner("Redacting..."):
+                    try:
+                        columns = st.session_state.data.columns
+                        
+                        desc_cols = []
+                        if COLUMN_MAPPING['description'] < len(columns):
+                            desc_cols.append(columns[COLUMN_MAPPING['description']])
+                        if COLUMN_MAPPING['description_translated'] < len(columns):
+                            desc_cols.append(columns[COLUMN_MAPPING['description_translated']])
+                        
+                        if desc_cols:
+                            st.session_state.data = redact_data(
+                                st.session_state.data, st.session_state.df_key, tuple(desc_cols)
+                            )
+                            st.session_state.pii_redacted = True
+                            st.session_state.df_key = f"{st.session_state.df_key}:redacted"
+                            st.session_state.mem_mb = st.session_state.data.estimated_size("mb")
+                            st.success("PII redacted")
+                    except Exception as e:
+                        st.warning(f"Warning: {str(e)}")
+            
+            st.divider()
+            
+            # Data summary
             st.markdown(f'{icon_html("bar_chart", 18, "#94a3b8")} **Data Summary**', unsafe_allow_html=True)
             
             df_info = st.session_state.data
@@ -339,8 +300,7 @@ def main():
             with col2:
                 st.metric("Cols", len(df_info.columns))
             
-            mem_mb = df_info.estimated_size() / (1024 * 1024)
-            st.caption(f"Memory: {mem_mb:.1f} MB")
+            st.caption(f"Memory: {st.session_state.mem_mb:.1f} MB")
     
     # Main content
     # Header with icon
@@ -365,146 +325,67 @@ def main():
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown(f'''
-<div style="background:#f8fafc;border:1px solid #e2e8f0;border-radius:10px;padding:1.25rem">
-<div style="display:flex;align-items:center;gap:8px;margin-bottom:0.75rem">
-{get_icon('file_text', 20, '#2563eb')}
-<span style="font-weight:600;color:#1e293b">Expected Data Structure</span>
-</div>
-<table style="width:100%;font-size:0.875rem;color:#475569">
-<tr><td style="padding:4px 0;border-bottom:1px solid #e2e8f0"><b>Col A</b></td><td>Queue Name</td></tr>
-<tr><td style="padding:4px 0;border-bottom:1px solid #e2e8f0"><b>Col J</b></td><td>Date/Time</td></tr>
-<tr><td style="padding:4px 0;border-bottom:1px solid #e2e8f0"><b>Col M</b></td><td>Description</td></tr>
-<tr><td style="padding:4px 0;border-bottom:1px solid #e2e8f0"><b>Col S</b></td><td>Partner</td></tr>
-<tr><td style="padding:4px 0;border-bottom:1px solid #e2e8f0"><b>Col U</b></td><td>Country</td></tr>
-<tr><td style="padding:4px 0"><b>Col V</b></td><td>Translation</td></tr>
-</table>
-</div>
-''', unsafe_allow_html=True)
+            st.markdown(data_structure_card(), unsafe_allow_html=True)
         
         with col2:
-            st.markdown(f'''
-<div style="background:#f8fafc;border:1px solid #e2e8f0;border-radius:10px;padding:1.25rem">
-<div style="display:flex;align-items:center;gap:8px;margin-bottom:0.75rem">
-{get_icon('zap', 20, '#2563eb')}
-<span style="font-weight:600;color:#1e293b">Features</span>
-</div>
-<ul style="margin:0;padding-left:1.25rem;font-size:0.875rem;color:#475569;line-height:1.8">
-<li>GDPR-compliant PII redaction</li>
-<li>7 analytics modules</li>
-<li>Automated regional insights</li>
-<li>Optimized for 50K+ rows</li>
-<li>Executive-ready outputs</li>
-</ul>
-</div>
-''', unsafe_allow_html=True)
+            st.markdown(features_card(), unsafe_allow_html=True)
         return
     
     df = st.session_state.data
     
-    st.markdown('<div style="height:1rem"></div>', unsafe_allow_html=True)
-    
-    # KPI row with icons
-    col1, col2, col3, col4 = st.columns(4)
-    
+    # KPI row with icons, emitted as a single element
     if analysis_mode == "Paramount Analysis":
-        processor = DataProcessor(df)
-        stats = processor.get_summary_stats()
-        
-        with col1:
-            st.markdown(metric_card(f"{stats['total_rows']:,}", "Total Cases", "users"), unsafe_allow_html=True)
-        
-        with col2:
-            country_col = processor.get_column('country')
-            markets = df[country_col].n_unique() if country_col else 0
-            st.markdown(metric_card(str(markets), "Markets", "globe"), unsafe_allow_html=True)
-        
-        with col3:
-            sky_pct = processor.get_sky_partner_percentage()
-            st.markdown(metric_card(f"{sky_pct:.1f}%", "Sky Partner", "partner"), unsafe_allow_html=True)
-        
-        with col4:
-            st.markdown(metric_card(f"{stats['memory_usage_mb']:.1f} MB", "Memory", "layers"), unsafe_allow_html=True)
-            
+        kpis = compute_paramount_kpis(df, st.session_state.df_key)
+        cards = [
+            metric_card(f"{kpis['total_rows']:,}", "Total Cases", "users"),
+            metric_card(str(kpis['markets']), "Markets", "globe"),
+            metric_card(f"{kpis['sky_pct']:.1f}%", "Sky Partner", "partner"),
+            metric_card(f"{kpis['memory_mb']:.1f} MB", "Memory", "layers")
+        ]
     else:
         # Generic KPIs for Analysis for All
-        with col1:
-             st.markdown(metric_card(f"{len(df):,}", "Total Rows", "users"), unsafe_allow_html=True)
-        
-        with col2:
-             st.markdown(metric_card(str(len(df.columns)), "Columns", "layout"), unsafe_allow_html=True)
-             
-        with col3:
-             # Count numeric columns
-             num_cols = len([c for c in df.columns if df[c].dtype in [pl.Int64, pl.Float64, pl.Int32, pl.Float32]])
-             st.markdown(metric_card(str(num_cols), "Numeric Vars", "hash"), unsafe_allow_html=True)
-             
-        with col4:
-             mem_mb = df.estimated_size() / (1024 * 1024)
-             st.markdown(metric_card(f"{mem_mb:.1f} MB", "Memory", "zap"), unsafe_allow_html=True)
-    
-    st.markdown('<div style="height:1.5rem"></div>', unsafe_allow_html=True)
-    
-    # Tabs with icons
+        kpis = compute_generic_kpis(df, st.session_state.df_key)
+        cards = [
+            metric_card(f"{kpis['total_rows']:,}", "Total Rows", "users"),
+            metric_card(str(kpis['total_columns']), "Columns", "layout"),
+            metric_card(str(kpis['numeric_cols']), "Numeric Vars", "hash"),
+            metric_card(f"{kpis['memory_mb']:.1f} MB", "Memory", "zap")
+        ]
+    
+    st.markdown(
+        '<div style="height:1rem"></div>' + metric_grid(cards) + '<div style="height:1.5rem"></div>',
+        unsafe_allow_html=True
+    )
+    
+    # View selector - only the selected module runs on each rerun
+    # (st.tabs executes every tab body regardless of which one is visible)
     if analysis_mode == "Paramount Analysis":
-        tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-            "Executive",
-            "Trends", 
-            "Sky Partners",
-            "Regional",
-            "Root Cause",
-            "Actions",
-            "Text Analysis"
-        ])
-        
-        config = {}
-        
-        with tab1:
-            try:
-                render_executive_dashboard(df, config)
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
-        
-        with tab2:
-            try:
-                render_time_intelligence(df, config)
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
-        
-        with tab3:
-            try:
-                render_sky_partner_analysis(df, config)
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
-        
-        with tab4:
-            try:
-                render_regional_deep_dive(df, config)
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
-        
-        with tab5:
-            try:
-                render_root_cause_analysis(df, config)
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
+        view = st.radio(
+            "View",
+            list(PARAMOUNT_VIEWS),
+            horizontal=True,
+            label_visibility="collapsed",
+            key="active_tab"
+        )
         
-        with tab6:
-            try:
-                render_recommendations(df, config)
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
+        # Content hash lets views key their own caches on the loaded frame
+        config = {
+            'df_key': st.session_state.df_key,
+            # Shared across reruns, so per-frame work memoised on it is kept
+            'processor': get_processor(df, st.session_state.df_key)
+        }
         
-        with tab7:
-            try:
-                render_text_analytics(df, config)
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
+        try:
+            renderer = getattr(modules, PARAMOUNT_VIEWS[view])
+            renderer(df, config)
+        except Exception as e:
+            st.error(f"Error: {str(e)}")
                 
     else:
         # Analysis for All
         try:
-            render_generic_analysis(df)
+            from modules.generic_analysis import render_generic_analysis
+            render_generic_analysis(df, {'df_key': st.session_state.df_key})
         except Exception as e:
             st.error(f"Error in Generic Analysis: {str(e)}")
 
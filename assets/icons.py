@@ -3,6 +3,9 @@ Lucide-style SVG Icons and UI Components
 Proper HTML components that render correctly in Streamlit
 """
 
+import re
+from functools import lru_cache
+
 # Base64 embedded icons as data URIs for reliable rendering
 # These are inline SVG strings that work with st.markdown(unsafe_allow_html=True)
 
@@ -34,17 +37,36 @@ ICONS = {
 }
 
 
-def get_icon(name: str, size: int = 20, color: str = 'currentColor') -> str:
-    """Get SVG icon by name."""
-    svg = ICONS.get(name, ICONS.get('chart', ''))
-    if size != 20:
-        svg = svg.replace('width="20"', f'width="{size}"')
-        svg = svg.replace('height="20"', f'height="{size}"')
-    if color != 'currentColor':
-        svg = svg.replace('stroke="currentColor"', f'stroke="{color}"')
-    return svg
+_SVG_PARTS = re.compile(r'<svg[^>]*?\swidth="(\d+)"[^>]*>(.*)</svg>', re.DOTALL)
+
+# Icon name -> (native width, inner markup); icons not drawn at 20px keep their own size
+_ICON_PARTS = {name: _SVG_PARTS.match(svg).groups() for name, svg in ICONS.items()}
 
+# Hidden <symbol> sheet; emitted once per page so each icon is a short <use> reference.
+# Kept inline: Streamlit static serving returns .svg as text/plain with nosniff,
+# so an external /app/static/icons.svg#icon-x reference would not render.
+ICON_SPRITE = (
+    '<svg xmlns="http://www.w3.org/2000/svg" style="position:absolute;width:0;height:0;overflow:hidden" aria-hidden="true">'
+    + ''.join(f'<symbol id="icon-{name}" viewBox="0 0 24 24">{body}</symbol>' for name, (_, body) in _ICON_PARTS.items())
+    + '</svg>'
+)
 
+
+@lru_cache(maxsize=512)
+def get_icon(name: str, size: int = 20, color: str = 'currentColor') -> str:
+    """Get SVG icon by name. Requires ICON_SPRITE on the page."""
+    if name not in _ICON_PARTS:
+        name = 'chart'
+    native = _ICON_PARTS[name][0]
+    if native != '20':
+        size = native
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 24 24" fill="none" '
+        f'stroke="{color}" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><use href="#icon-{name}"/></svg>'
+    )
+
+
+@lru_cache(maxsize=512)
 def icon_text(name: str, text: str, size: int = 18, color: str = '#64748b') -> str:
     """
     Create icon + text combination that renders properly in Streamlit.
@@ -57,71 +79,99 @@ def icon_text(name: str, text: str, size: int = 18, color: str = '#64748b') -> s
 </div>'''
 
 
+@lru_cache(maxsize=512)
 def section_header(title: str, icon_name: str, subtitle: str = '') -> str:
     """Generate a section header with icon - full HTML block."""
     icon = get_icon(icon_name, 24, '#2563eb')
-    subtitle_html = f'<p style="color:#64748b;font-size:0.875rem;margin:0">{subtitle}</p>' if subtitle else ''
+    subtitle_html = f'<p class="aw-section-subtitle">{subtitle}</p>' if subtitle else ''
     return f'''
-<div style="display:flex;align-items:center;gap:12px;margin-bottom:1.25rem;padding-bottom:0.75rem;border-bottom:1px solid #e2e8f0">
-<div style="display:flex;align-items:center;justify-content:center;width:44px;height:44px;background:linear-gradient(135deg,#eff6ff,#dbeafe);border-radius:10px">
+<div class="aw-section">
+<div class="aw-icon-box">
 {icon}
 </div>
 <div>
-<h2 style="margin:0;font-size:1.375rem;font-weight:700;color:#1e293b">{title}</h2>
+<h2 class="aw-section-title">{title}</h2>
 {subtitle_html}
 </div>
 </div>
 '''
 
 
+@lru_cache(maxsize=256)
 def metric_card(value: str, label: str, icon_name: str, trend: str = None, trend_up: bool = True) -> str:
-    """Generate a styled metric card with icon - complete HTML component."""
+    """Generate a styled metric card with icon - complete HTML component. Memoized: cards repeat across reruns."""
     icon = get_icon(icon_name, 24, '#2563eb')
     
     trend_html = ''
     if trend:
         trend_color = '#059669' if trend_up else '#dc2626'
         trend_arrow = get_icon('arrow_up' if trend_up else 'arrow_down', 14, trend_color)
-        trend_html = f'<span style="display:inline-flex;align-items:center;gap:2px;color:{trend_color};font-size:0.75rem;font-weight:500">{trend_arrow}{trend}</span>'
+        trend_html = f'<span class="aw-trend" style="color:{trend_color}">{trend_arrow}{trend}</span>'
     
     return f'''
-<div style="background:#f8fafc;border:1px solid #e2e8f0;border-radius:10px;padding:1.25rem">
-<div style="display:flex;align-items:flex-start;justify-content:space-between">
+<div class="aw-metric">
+<div class="aw-metric-row">
 <div>
-<p style="color:#64748b;font-size:0.75rem;font-weight:500;text-transform:uppercase;letter-spacing:0.05em;margin:0 0 6px 0">{label}</p>
-<div style="display:flex;align-items:baseline;gap:8px">
-<span style="font-size:1.75rem;font-weight:700;color:#1e293b">{value}</span>
+<p class="aw-metric-label">{label}</p>
+<div class="aw-metric-values">
+<span class="aw-metric-value">{value}</span>
 {trend_html}
 </div>
 </div>
-<div style="display:flex;align-items:center;justify-content:center;width:44px;height:44px;background:#eff6ff;border-radius:10px">{icon}</div>
+<div class="aw-icon-box">{icon}</div>
 </div>
 </div>
 '''
 
 
+def metric_grid(cards: list, columns: int = 0) -> str:
+    """
+    Lay out metric cards in one CSS grid row - single HTML component.
+    Replaces st.columns + one st.markdown per card.
+    """
+    columns = columns or len(cards)
+    return f'''<div style="display:grid;grid-template-columns:repeat({columns},minmax(0,1fr));gap:1rem">
+{''.join(cards)}
+</div>'''
+
+
+# Icon stroke per info_card variant; card colours come from the aw-info-<color> rules in app.css
+INFO_ICON_COLORS = {
+    'blue': '#2563eb',
+    'green': '#059669',
+    'yellow': '#d97706',
+    'red': '#dc2626',
+}
+
+# Priority -> (foreground, background)
+PRIORITY_COLORS = {
+    'P0': ('#dc2626', '#fef2f2'),
+    'P1': ('#ea580c', '#fff7ed'),
+    'P2': ('#2563eb', '#eff6ff'),
+    'CRITICAL': ('#dc2626', '#fef2f2'),
+    'HIGH': ('#ea580c', '#fff7ed'),
+    'MEDIUM': ('#d97706', '#fffbeb'),
+    'LOW': ('#059669', '#ecfdf5')
+}
+
+
+@lru_cache(maxsize=512)
 def info_card(title: str, content: str, icon_name: str = 'info', color: str = 'blue') -> str:
     """
     Generate a styled info card - REPLACES st.info() for proper icon rendering.
     Use with st.markdown(card, unsafe_allow_html=True)
     """
-    colors = {
-        'blue': ('#2563eb', '#eff6ff', '#dbeafe'),
-        'green': ('#059669', '#ecfdf5', '#d1fae5'),
-        'yellow': ('#d97706', '#fffbeb', '#fef3c7'),
-        'red': ('#dc2626', '#fef2f2', '#fee2e2'),
-    }
-    
-    fg, bg, border = colors.get(color, colors['blue'])
-    icon = get_icon(icon_name, 20, fg)
+    if color not in INFO_ICON_COLORS:
+        color = 'blue'
+    icon = get_icon(icon_name, 20, INFO_ICON_COLORS[color])
     
     return f'''
-<div style="background:{bg};border-left:4px solid {fg};border-radius:0 8px 8px 0;padding:1rem 1.25rem;margin:0.5rem 0">
-<div style="display:flex;align-items:flex-start;gap:12px">
-<div style="flex-shrink:0;margin-top:2px">{icon}</div>
+<div class="aw-info aw-info-{color}">
+<div class="aw-info-body">
+<div class="aw-info-icon">{icon}</div>
 <div>
-<p style="font-weight:600;color:{fg};margin:0 0 4px 0;font-size:0.9rem">{title}</p>
-<p style="color:#475569;margin:0;font-size:0.875rem;line-height:1.5">{content}</p>
+<p class="aw-info-title">{title}</p>
+<p class="aw-info-text">{content}</p>
 </div>
 </div>
 </div>
@@ -143,24 +193,16 @@ def error_card(title: str, content: str) -> str:
     return info_card(title, content, 'alert', 'red')
 
 
+@lru_cache(maxsize=512)
 def priority_badge(priority: str) -> str:
     """Generate priority badge HTML."""
-    colors = {
-        'P0': ('#dc2626', '#fef2f2'),
-        'P1': ('#ea580c', '#fff7ed'),
-        'P2': ('#2563eb', '#eff6ff'),
-        'CRITICAL': ('#dc2626', '#fef2f2'),
-        'HIGH': ('#ea580c', '#fff7ed'),
-        'MEDIUM': ('#d97706', '#fffbeb'),
-        'LOW': ('#059669', '#ecfdf5')
-    }
-    
-    fg, bg = colors.get(priority.upper(), ('#64748b', '#f1f5f9'))
+    fg, bg = PRIORITY_COLORS.get(priority.upper(), ('#64748b', '#f1f5f9'))
     
-    return f'<span style="background:{bg};color:{fg};padding:4px 10px;border-radius:4px;font-size:0.75rem;font-weight:600;letter-spacing:0.025em">{priority}</span>'
+    return f'<span class="aw-badge" style="background:{bg};color:{fg}">{priority}</span>'
 
 
 # DEPRECATED - use icon_text instead
+@lru_cache(maxsize=512)
 def icon_html(name: str, size: int = 20, color: str = '#64748b') -> str:
     """Legacy function - use icon_text() for better rendering."""
     svg = get_icon(name, size, color)
@@ -2,6 +2,8 @@
 Configuration settings for Data Storyteller Analytics App
 """
 
+from types import MappingProxyType
+
 # Column mappings (0-based indexing for Polars)
 COLUMN_MAPPING = {
     'queue': 0,                      # Column A (index 0)
@@ -90,6 +92,16 @@ KEYWORDS = {
     }
 }
 
+# Flat (keyword, theme, weight) rows for per-text scoring loops.
+# Plain substring checks are deliberate: on short descriptions CPython's `in`
+# outruns a compiled re alternation, even as a per-theme prefilter, and an
+# alternation cannot report the overlapping phrases the weights rely on.
+KEYWORD_ROWS = tuple(
+    (keyword, theme, weight)
+    for theme, keyword_dict in KEYWORDS.items()
+    for keyword, weight in keyword_dict.items()
+)
+
 # Severity thresholds (percentages)
 SEVERITY_THRESHOLDS = {
     'critical': 15,
@@ -137,3 +149,12 @@ RECOMMENDATIONS = {
         'reduction': 0.08
     }
 }
+
+# Shared constants are read-only so no module can mutate them under another's cache
+COLUMN_MAPPING = MappingProxyType(COLUMN_MAPPING)
+DYNAMIC_COLUMNS = MappingProxyType({name: tuple(patterns) for name, patterns in DYNAMIC_COLUMNS.items()})
+COLORS = MappingProxyType(COLORS)
+CHART_COLORS = tuple(CHART_COLORS)
+SEVERITY_THRESHOLDS = MappingProxyType(SEVERITY_THRESHOLDS)
+TREND_THRESHOLDS = MappingProxyType(TREND_THRESHOLDS)
+RECOMMENDATIONS = MappingProxyType({key: MappingProxyType(rec) for key, rec in RECOMMENDATIONS.items()})
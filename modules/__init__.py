@@ -1,8 +1,34 @@
 """Analytics modules for the Paramount+ Customer Analytics App."""
-from .executive_dashboard import render_executive_dashboard
-from .time_intelligence import render_time_intelligence
-from .sky_partner_analysis import render_sky_partner_analysis
-from .regional_deep_dive import render_regional_deep_dive
-from .root_cause_analysis import render_root_cause_analysis
-from .recommendations import render_recommendations
-from .text_analytics_module import render_text_analytics
+import importlib
+import os
+import sys
+
+# Submodules import config/utils/assets as top-level packages; make the app root
+# importable once here instead of in every submodule
+_PKG_DIR = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_PKG_DIR)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+# Render functions are resolved on first access so that importing one
+# module does not pull in every other module's dependencies
+_RENDERERS = {
+    'render_executive_dashboard': 'executive_dashboard',
+    'render_time_intelligence': 'time_intelligence',
+    'render_sky_partner_analysis': 'sky_partner_analysis',
+    'render_regional_deep_dive': 'regional_deep_dive',
+    'render_root_cause_analysis': 'root_cause_analysis',
+    'render_recommendations': 'recommendations',
+    'render_text_analytics': 'text_analytics_module',
+}
+
+__all__ = list(_RENDERERS)
+
+
+def __getattr__(name):
+    if name in _RENDERERS:
+        module = importlib.import_module(f'.{_RENDERERS[name]}', __name__)
+        # Bind on the package so later lookups skip __getattr__ entirely
+        renderer = globals()[name] = getattr(module, name)
+        return renderer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
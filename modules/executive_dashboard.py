@@ -6,14 +6,90 @@ High-level KPIs and strategic insights with visual icons
 import streamlit as st
 import polars as pl
 from typing import Dict, Any
-import sys
-import os
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import COLORS
-from utils.visualizations import ChartBuilder
 from utils.data_processor import DataProcessor
-from assets.icons import section_header, metric_card, info_card, success_card, icon_text
+from assets.icons import section_header, metric_card, metric_grid, info_card, success_card, icon_text
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _exec_metrics(_df: pl.DataFrame, df_key: str) -> Dict[str, Any]:
+    """Compute every dashboard aggregate once per loaded frame."""
+    processor = DataProcessor(_df)
+    country_col = processor.get_column('country')
+    cat_col = processor.get_column('category')
+    issue_col = processor.get_column('issue')
+    
+    bundle = processor.executive_bundle(country_col, cat_col, issue_col)
+    total_cases = bundle['total_rows']
+    
+    # The top-10 leader doubles as the top market
+    top_countries = bundle['top_countries']
+    if len(top_countries) > 0:
+        top_country = str(top_countries[country_col][0])
+        top_country_count = int(top_countries['count'][0])
+    else:
+        top_country = 'N/A'
+        top_country_count = 0
+    
+    top_issue_df = bundle['top_issue']
+    if len(top_issue_df) > 0:
+        top_issue = str(top_issue_df[issue_col][0])
+        top_issue_count = int(top_issue_df['count'][0])
+        top_issue_pct = round(top_issue_count / total_cases * 100, 1) if total_cases > 0 else 0
+    else:
+        top_issue = 'N/A'
+        top_issue_count = 0
+        top_issue_pct = 0
+    
+    return {
+        'total_cases': total_cases,
+        'unique_markets': bundle['unique_markets'],
+        'sky_pct': bundle['sky_pct'],
+        'sky_count': bundle['sky_count'],
+        'country_col': country_col,
+        'top_countries': top_countries,
+        'top_country': top_country,
+        'top_country_count': top_country_count,
+        'top_issue': top_issue,
+        'top_issue_count': top_issue_count,
+        'top_issue_pct': top_issue_pct,
+        'dist_col': bundle['dist_col'],
+        'dist': bundle['distribution'],
+    }
+
+
+CHART_HEIGHT = 380
+STATIC_CHART_WIDTH = 700
+
+
+def _build_chart(kind: str, data: pl.DataFrame, x: str, y: str):
+    """Build one of the dashboard's two Plotly figures."""
+    # Plotly only loads once a chart actually has to be built
+    from utils.visualizations import ChartBuilder
+    
+    charts = ChartBuilder(height=CHART_HEIGHT)
+    if kind == 'bar':
+        return charts.create_bar_chart(data, x, y, title='', horizontal=True)
+    return charts.create_pie_chart(data, x, y, title='')
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _chart_png(kind: str, df_key: str, _data: pl.DataFrame, x: str, y: str) -> bytes:
+    """Rasterise a chart once per frame so reruns skip shipping Plotly.js. Needs kaleido."""
+    fig = _build_chart(kind, _data, x, y)
+    return fig.to_image(format='png', width=STATIC_CHART_WIDTH, height=CHART_HEIGHT, scale=2)
+
+
+def _show_chart(kind: str, df_key: str, data: pl.DataFrame, x: str, y: str, interactive: bool):
+    """Show a chart as a cached PNG, or as Plotly when asked or when kaleido is missing."""
+    if not interactive:
+        try:
+            st.image(_chart_png(kind, df_key, data, x, y), use_column_width=True)
+            return
+        except (ImportError, ValueError):
+            pass
+    st.plotly_chart(_build_chart(kind, data, x, y), use_container_width=True)
 
 
 def render_executive_dashboard(df: pl.DataFrame, config: Dict[str, Any]):
@@ -22,133 +98,88 @@ def render_executive_dashboard(df: pl.DataFrame, config: Dict[str, Any]):
     # Section header with icon
     st.markdown(section_header("Executive Dashboard", "dashboard", "High-level KPIs and strategic insights"), unsafe_allow_html=True)
     
-    processor = DataProcessor(df)
-    stats = processor.get_summary_stats()
+    # Reuse the upload hash when the app provides one
+    df_key = config.get('df_key') or str(df.hash_rows().sum())
     
     # Build KPI metrics
     try:
-        total_cases = stats['total_rows']
-        
-        # Unique markets
-        country_col = processor.get_column('country')
-        unique_markets = df[country_col].n_unique() if country_col and country_col in df.columns else 0
-        
-        # Sky partner percentage
-        sky_pct = processor.get_sky_partner_percentage()
-        sky_count = processor.get_sky_partner_count()
-        
-        # Top country
-        if country_col and country_col in df.columns:
-            top_country_df = processor.get_top_n(country_col, 1)
-            top_country = str(top_country_df[country_col][0]) if len(top_country_df) > 0 else 'N/A'
-            top_country_count = int(top_country_df['count'][0]) if len(top_country_df) > 0 else 0
-        else:
-            top_country = 'N/A'
-            top_country_count = 0
-        
-        # Top issue
-        subcat_col = processor.get_column('subcategory')
-        cat_col = processor.get_column('category')
-        issue_col = subcat_col if subcat_col else cat_col
-        
-        if issue_col and issue_col in df.columns:
-            top_issue_df = processor.get_top_n(issue_col, 1)
-            top_issue = str(top_issue_df[issue_col][0]) if len(top_issue_df) > 0 else 'N/A'
-            top_issue_count = int(top_issue_df['count'][0]) if len(top_issue_df) > 0 else 0
-            top_issue_pct = round(top_issue_count / total_cases * 100, 1) if total_cases > 0 else 0
-        else:
-            top_issue = 'N/A'
-            top_issue_count = 0
-            top_issue_pct = 0
+        metrics = _exec_metrics(df, df_key)
     except Exception as e:
         st.error(f"Error calculating metrics: {str(e)}")
         return
     
-    # Metrics row
-    col1, col2, col3, col4, col5 = st.columns(5)
+    total_cases = metrics['total_cases']
+    unique_markets = metrics['unique_markets']
+    sky_pct = metrics['sky_pct']
+    sky_count = metrics['sky_count']
+    country_col = metrics['country_col']
+    top_country = metrics['top_country']
+    top_country_count = metrics['top_country_count']
+    top_issue = metrics['top_issue']
+    top_issue_count = metrics['top_issue_count']
+    top_issue_pct = metrics['top_issue_pct']
     
-    with col1:
-        st.markdown(metric_card(f"{total_cases:,}", "Total Cases", "users"), unsafe_allow_html=True)
-    with col2:
-        st.markdown(metric_card(str(unique_markets), "Markets", "globe"), unsafe_allow_html=True)
-    with col3:
-        st.markdown(metric_card(f"{sky_pct:.1f}%", "Sky Partner", "partner"), unsafe_allow_html=True)
-    with col4:
-        st.markdown(metric_card(f"{top_issue_pct:.1f}%", "Top Issue Share", "target"), unsafe_allow_html=True)
-    with col5:
-        st.markdown(metric_card(top_country, "Top Market", "map"), unsafe_allow_html=True)
+    # Metrics row - one grid element instead of five columns
+    st.markdown(metric_grid([
+        metric_card(f"{total_cases:,}", "Total Cases", "users"),
+        metric_card(str(unique_markets), "Markets", "globe"),
+        metric_card(f"{sky_pct:.1f}%", "Sky Partner", "partner"),
+        metric_card(f"{top_issue_pct:.1f}%", "Top Issue Share", "target"),
+        metric_card(top_country, "Top Market", "map"),
+    ]), unsafe_allow_html=True)
     
     st.divider()
     
-    # Charts Row
+    # Charts Row - static images by default, Plotly on request
+    interactive = st.toggle("Interactive charts", value=False, key="exec_interactive_charts")
     chart_col1, chart_col2 = st.columns(2)
-    charts = ChartBuilder(height=380)
     
     with chart_col1:
         st.markdown(icon_text("bar_chart", "Top 10 Countries", 18, "#2563eb"), unsafe_allow_html=True)
-        if country_col and country_col in df.columns:
-            top_countries = processor.get_top_n(country_col, 10)
+        # country_col is only set when detected in this frame
+        if country_col:
+            top_countries = metrics['top_countries']
             if len(top_countries) > 0:
-                fig = charts.create_bar_chart(
-                    top_countries, country_col, 'count',
-                    title='',
-                    horizontal=True
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                _show_chart('bar', df_key, top_countries, country_col, 'count', interactive)
         else:
             st.info("Country column not found")
     
     with chart_col2:
         st.markdown(icon_text("pie_chart", "Category Distribution", 18, "#2563eb"), unsafe_allow_html=True)
-        if cat_col and cat_col in df.columns:
-            cat_dist = processor.get_distribution(cat_col).head(8)
-            if len(cat_dist) > 0:
-                fig = charts.create_pie_chart(
-                    cat_dist, cat_col, 'count',
-                    title=''
-                )
-                st.plotly_chart(fig, use_container_width=True)
-        elif issue_col and issue_col in df.columns:
-            issue_dist = processor.get_distribution(issue_col).head(8)
-            if len(issue_dist) > 0:
-                fig = charts.create_pie_chart(
-                    issue_dist, issue_col, 'count',
-                    title=''
-                )
-                st.plotly_chart(fig, use_container_width=True)
+        if metrics['dist_col']:
+            dist = metrics['dist']
+            if len(dist) > 0:
+                _show_chart('pie', df_key, dist, metrics['dist_col'], 'count', interactive)
         else:
             st.info("Category column not found")
     
     st.divider()
     
     # Executive Summary with proper icon cards
-    st.markdown(icon_text("sparkles", "Executive Summary", 20, "#2563eb"), unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown(info_card(
-            f"Top Issue: {top_issue}",
-            f"Accounts for {top_issue_pct:.1f}% of total volume ({top_issue_count:,} cases). This is the primary driver of contact center load.",
-            "target", "blue"
-        ), unsafe_allow_html=True)
-        
-        st.markdown(info_card(
-            f"Sky Partner Impact: {sky_pct:.1f}%",
-            f"{sky_count:,} cases involve Sky partner integrations. These represent a significant escalation pathway.",
-            "partner", "blue"
-        ), unsafe_allow_html=True)
-    
-    with col2:
-        top_country_pct = round(top_country_count / total_cases * 100, 1) if total_cases > 0 else 0
-        st.markdown(info_card(
-            f"Market Concentration: {top_country}",
-            f"Leads with {top_country_count:,} cases ({top_country_pct}% of global). Consider market-specific interventions.",
-            "globe", "blue"
-        ), unsafe_allow_html=True)
-        
-        reduction_potential = int(top_issue_pct * 0.7) if top_issue_pct > 0 else 0
-        st.markdown(success_card(
-            "Strategic Recommendation",
-            f'Prioritize "{top_issue}" — addressing this single issue could reduce overall contact volume by up to {reduction_potential}%.'
-        ), unsafe_allow_html=True)
+    # Two stacked cards per grid cell; heading and grid go out as one element
+    left = info_card(
+        f"Top Issue: {top_issue}",
+        f"Accounts for {top_issue_pct:.1f}% of total volume ({top_issue_count:,} cases). This is the primary driver of contact center load.",
+        "target", "blue"
+    ) + info_card(
+        f"Sky Partner Impact: {sky_pct:.1f}%",
+        f"{sky_count:,} cases involve Sky partner integrations. These represent a significant escalation pathway.",
+        "partner", "blue"
+    )
+    
+    top_country_pct = round(top_country_count / total_cases * 100, 1) if total_cases > 0 else 0
+    reduction_potential = int(top_issue_pct * 0.7) if top_issue_pct > 0 else 0
+    right = info_card(
+        f"Market Concentration: {top_country}",
+        f"Leads with {top_country_count:,} cases ({top_country_pct}% of global). Consider market-specific interventions.",
+        "globe", "blue"
+    ) + success_card(
+        "Strategic Recommendation",
+        f'Prioritize "{top_issue}" — addressing this single issue could reduce overall contact volume by up to {reduction_potential}%.'
+    )
+    
+    st.markdown(
+        icon_text("sparkles", "Executive Summary", 20, "#2563eb") +
+        metric_grid([f'<div>{left}</div>', f'<div>{right}</div>'], 2),
+        unsafe_allow_html=True
+    )
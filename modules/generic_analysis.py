@@ -6,18 +6,102 @@ Flexible analysis for any dataset with user-selected variables
 import streamlit as st
 import polars as pl
 import plotly.express as px
+import plotly.graph_objects as go
 from typing import Dict, Any, List, Optional
-import sys
-import os
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from assets.icons import section_header, metric_card, info_card, success_card, warning_card, priority_badge, error_card
 from utils.visualizations import ChartBuilder
 
+# |sample skewness| above this is reported as a skewed distribution
+SKEW_THRESHOLD = 0.5
 
-def render_overview(df: pl.DataFrame, categorical_cols: List[str], numerical_cols: List[str]):
+# Categories kept per axis in the cross-tab heatmap
+CROSSTAB_MAX_CATEGORIES = 25
+
+# Chart payload caps: histogram bins and the most recent sparkline buckets
+HISTOGRAM_BINS = 50
+SPARKLINE_POINTS = 60
+HISTOGRAM_SAMPLE_ROWS = 200_000
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _overview_stats(_df: pl.DataFrame, df_key: str, cat_cols: tuple, num_cols: tuple) -> Dict[str, Any]:
+    """Compute the overview aggregates once per frame and variable selection."""
+    stats = {'categorical': [], 'describe': None, 'top_cat': None, 'avg': None, 'median': None}
+    total = len(_df)
+    
+    # Every scalar the overview needs, gathered in a single query
+    exprs = []
+    for i, col in enumerate(cat_cols[:4]):
+        exprs += [pl.col(col).n_unique().alias(f'nu_{i}'), pl.col(col).mode().first().alias(f'mode_{i}')]
+    if cat_cols:
+        col = cat_cols[0]
+        exprs += [
+            # Concentration Risk; row 0 is also the leading category and its count
+            pl.col(col).value_counts(sort=True).head(3).implode().alias('top3'),
+        ]
+    if num_cols:
+        # Kept at source precision: a Float32 cast is an extra pass that costs more
+        # than it saves, and the values are printed to cents with thousands separators
+        exprs += [pl.col(num_cols[0]).mean().alias('avg'), pl.col(num_cols[0]).median().alias('median')]
+    
+    row = _df.lazy().select(exprs).collect().row(0, named=True) if exprs else {}
+    
+    for i, col in enumerate(cat_cols[:4]):
+        top_val = row[f'mode_{i}'] if total > 0 else "N/A"
+        stats['categorical'].append((col, row[f'nu_{i}'], top_val))
+    
+    if num_cols:
+        stats['describe'] = _df.select(list(num_cols)).describe()
+        stats['avg'] = row['avg']
+        stats['median'] = row['median']
+    
+    if cat_cols and total > 0:
+        top3 = row['top3']
+        stats['top_cat'] = top3[0][cat_cols[0]]
+        stats['top_3_pct'] = round(sum(r['count'] for r in top3) / total * 100, 1)
+        stats['pct'] = round(top3[0]['count'] / total * 100, 1)
+    
+    return stats
+
+
+# Parsed frames are shared resources (see app.py); both date views reuse one parse
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _parsed_dates(_df: pl.DataFrame, df_key: str, date_col: str) -> pl.DataFrame:
+    """Parse date_col into a sorted, non-null '_parsed_date' column once per frame."""
+    if _df.schema[date_col] in (pl.Utf8, pl.Categorical):
+        # Simple optimistic parsing
+        parsed = pl.col(date_col).cast(pl.Utf8).str.to_date(strict=False)
+    else:
+        parsed = pl.col(date_col)
+    return _df.with_columns(parsed.alias('_parsed_date')).drop_nulls('_parsed_date').sort('_parsed_date')
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _temporal_agg(_df: pl.DataFrame, df_key: str, date_col: str, every: str, num_col: Optional[str] = None) -> pl.DataFrame:
+    """Bucket the parsed dates into record counts and a value (sum of num_col, else count)."""
+    return _parsed_dates(_df, df_key, date_col).group_by_dynamic('_parsed_date', every=every).agg(
+        pl.len().alias('records'),
+        pl.sum(num_col).alias('value') if num_col else pl.len().alias('value')
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _correlations(_df: pl.DataFrame, df_key: str, num_cols: tuple) -> Dict[tuple, float]:
+    """Pearson correlation for every pair of num_cols, computed in one select."""
+    # Pairwise pl.corr skips nulls per pair; DataFrame.corr goes through NumPy
+    # and turns any null into NaN for the whole column
+    pairs = [(a, b) for i, a in enumerate(num_cols) for b in num_cols[i + 1:]]
+    if not pairs:
+        return {}
+    values = _df.select(pl.corr(a, b).alias(f'{i}') for i, (a, b) in enumerate(pairs)).row(0)
+    return dict(zip(pairs, values))
+
+
+def render_overview(df: pl.DataFrame, categorical_cols: List[str], numerical_cols: List[str], df_key: str):
     """Render high-level overview of selected variables."""
+    stats = _overview_stats(df, df_key, tuple(categorical_cols), tuple(numerical_cols))
+    
     st.markdown(section_header("Analysis Overview", "dashboard", "Summary statistics for selected variables"), unsafe_allow_html=True)
     
     # Key metrics
@@ -27,7 +111,7 @@ def render_overview(df: pl.DataFrame, categorical_cols: List[str], numerical_col
     with col2:
         st.markdown(metric_card(str(len(df.columns)), "Total Columns", "layers"), unsafe_allow_html=True)
     with col3:
-        memory_mb = df.estimated_size() / (1024 * 1024)
+        memory_mb = df.estimated_size("mb")
         st.markdown(metric_card(f"{memory_mb:.1f} MB", "Memory Usage", "zap"), unsafe_allow_html=True)
 
     st.divider()
@@ -36,35 +120,24 @@ def render_overview(df: pl.DataFrame, categorical_cols: List[str], numerical_col
     if categorical_cols:
         st.subheader("Categorical Variables")
         cols = st.columns(min(len(categorical_cols), 4))
-        for idx, col in enumerate(categorical_cols[:4]):
-            unique_count = df[col].n_unique()
-            mode_result = df[col].mode()
-            top_val = mode_result.item(0) if len(mode_result) > 0 else "N/A"
+        for idx, (col, unique_count, top_val) in enumerate(stats['categorical']):
             with cols[idx]:
                 st.metric(f"{col}", f"{unique_count} unique", f"Top: {top_val}")
 
     # Numerical summary
     if numerical_cols:
         st.subheader("Numerical Variables")
-        st.dataframe(df.select(numerical_cols).describe(), use_container_width=True)
+        st.dataframe(stats['describe'], use_container_width=True)
 
     # Narrative
     st.subheader("Automated Insights")
     
     if categorical_cols:
         col = categorical_cols[0]
-        mode_res = df[col].mode()
-        if len(mode_res) > 0:
-            top_cat = mode_res.item(0)
-            
-            # Concentration Risk
-            top_3_pct = 0
-            count_df = df.group_by(col).agg(pl.count().alias('count')).sort('count', descending=True).head(3)
-            if len(count_df) > 0:
-                top_3_pct = round(count_df['count'].sum() / len(df) * 100, 1)
-                
-            count = len(df.filter(pl.col(col) == top_cat))
-            pct = round(count / len(df) * 100, 1)
+        if 'pct' in stats:
+            top_cat = stats['top_cat']
+            top_3_pct = stats['top_3_pct']
+            pct = stats['pct']
             
             if top_3_pct > 80:
                 st.markdown(warning_card(
@@ -82,8 +155,8 @@ def render_overview(df: pl.DataFrame, categorical_cols: List[str], numerical_col
             
     if numerical_cols:
         col = numerical_cols[0]
-        avg = df[col].mean()
-        median = df[col].median()
+        avg = stats['avg']
+        median = stats['median']
         if avg and median:
             diff_pct = abs(avg - median) / median * 100 if median != 0 else 0
             
@@ -113,13 +186,10 @@ def render_distribution_analysis(df: pl.DataFrame, categorical_cols: List[str],
         selected_col = st.selectbox("Select Variable", categorical_cols)
         
         # Calculate distribution
-        dist = (
-            df.group_by(selected_col)
-            .agg(pl.count().alias('count'))
-            .sort('count', descending=True)
-            .head(20)
-        )
+        dist = df.get_column(selected_col).value_counts(sort=True).head(20)
         
+        # Plain conversion: date columns land here too, and Plotly 5.18 can't
+        # read Arrow-backed date32 columns
         fig = px.bar(
             dist.to_pandas(), 
             x=selected_col, 
@@ -137,9 +207,9 @@ def render_distribution_analysis(df: pl.DataFrame, categorical_cols: List[str],
             share = round(top_count / total * 100, 1)
             
             # Pareto Analysis
-            cum_share = dist['count'].cumsum()
-            pareto_idx = len(cum_share.filter(cum_share <= total * 0.8))
-            pareto_pct = round(pareto_idx / dist[selected_col].n_unique() * 100, 1) if dist[selected_col].n_unique() > 0 else 0
+            # dist rows are already unique categories, so its length is the category count
+            pareto_idx = (dist['count'].cum_sum() <= total * 0.8).sum()
+            pareto_pct = round(pareto_idx / len(dist) * 100, 1)
             
             if share > 50:
                 st.markdown(warning_card(
@@ -158,29 +228,39 @@ def render_distribution_analysis(df: pl.DataFrame, categorical_cols: List[str],
     elif col_type == "Numerical" and numerical_cols:
         selected_col = st.selectbox("Select Variable", numerical_cols)
         
+        # Raw rows go to the browser here, so cap them; a sample keeps the shape
+        title = f"Distribution of {selected_col}"
+        plot_df = df.select(selected_col)
+        if len(plot_df) > HISTOGRAM_SAMPLE_ROWS:
+            plot_df = plot_df.sample(n=HISTOGRAM_SAMPLE_ROWS, seed=0)
+            title += f" (sample of {HISTOGRAM_SAMPLE_ROWS // 1000}k)"
+        
         fig = px.histogram(
-            df.to_pandas(), 
+            plot_df.to_pandas(use_pyarrow_extension_array=True), 
             x=selected_col, 
-            title=f"Distribution of {selected_col}",
-            marginal="box"
+            title=title,
+            marginal="box",
+            nbins=HISTOGRAM_BINS
         )
         st.plotly_chart(fig, use_container_width=True)
         
         # Narrative
-        stats = df[selected_col].describe()
-        mean_val = df[selected_col].mean()
-        median_val = df[selected_col].median()
+        skew, q1, q3 = df.select(
+            pl.col(selected_col).skew(),
+            pl.col(selected_col).quantile(0.25).alias('q1'),
+            pl.col(selected_col).quantile(0.75).alias('q3'),
+        ).row(0)
         
         layout = "symmetric"
-        if mean_val > median_val * 1.1:
+        if skew is not None and skew > SKEW_THRESHOLD:
             layout = "right-skewed (high outliers)"
-        elif mean_val < median_val * 0.9:
+        elif skew is not None and skew < -SKEW_THRESHOLD:
             layout = "left-skewed (low outliers)"
             
         if layout.startswith("right") or layout.startswith("left"):
              st.markdown(warning_card(
                 f"Skewed Distribution Detected - {layout}",
-                f"The distribution is not symmetrical. 50% of values fall between **{df[selected_col].quantile(0.25):,.2f}** and **{df[selected_col].quantile(0.75):,.2f}**. "
+                f"The distribution is not symmetrical. 50% of values fall between **{q1:,.2f}** and **{q3:,.2f}**. "
                 "**Action:** Use median instead of mean for forecasting to avoid outlier bias."
             ), unsafe_allow_html=True)
         else:
@@ -207,22 +287,37 @@ def render_crosstab_analysis(df: pl.DataFrame, categorical_cols: List[str]):
         col_var = st.selectbox("Column Variable", [c for c in categorical_cols if c != row_var], index=0)
         
     # Matrix chart
+    # Nulls become their own category so is_in() below can still match them
     crosstab = (
-        df.group_by([row_var, col_var])
-        .agg(pl.count().alias('count'))
+        df.group_by([
+            pl.col(row_var).cast(pl.Utf8).fill_null('(missing)'),
+            pl.col(col_var).cast(pl.Utf8).fill_null('(missing)'),
+        ])
+        .agg(pl.len().alias('count'))
         .sort('count', descending=True)
-        .head(50)  # Limit for performance
     )
     
-    fig = px.density_heatmap(
-        crosstab.to_pandas(),
-        x=col_var,
-        y=row_var,
-        z='count',
-        title=f"Heatmap: {row_var} vs {col_var}",
-        color_continuous_scale='Viridis'
+    # Pivot the busiest categories on each axis into a small matrix so Plotly
+    # draws it directly instead of re-binning long-form rows
+    top_rows = crosstab.group_by(row_var).agg(pl.sum('count')).sort('count', descending=True).head(CROSSTAB_MAX_CATEGORIES)[row_var]
+    top_cols = crosstab.group_by(col_var).agg(pl.sum('count')).sort('count', descending=True).head(CROSSTAB_MAX_CATEGORIES)[col_var]
+    matrix = (
+        crosstab.filter(pl.col(row_var).is_in(top_rows) & pl.col(col_var).is_in(top_cols))
+        .pivot(values='count', index=row_var, columns=col_var)
+        .fill_null(0)
     )
-    st.plotly_chart(fig, use_container_width=True)
+    
+    if len(matrix) == 0 or matrix.width <= 1:
+        st.info("Not enough data to build a heatmap for this combination.")
+    else:
+        fig = go.Figure(go.Heatmap(
+            z=matrix.drop(row_var).to_numpy(),
+            x=matrix.columns[1:],
+            y=matrix[row_var].to_list(),
+            colorscale='Viridis'
+        ))
+        fig.update_layout(title=f"Heatmap: {row_var} vs {col_var}", xaxis_title=col_var, yaxis_title=row_var)
+        st.plotly_chart(fig, use_container_width=True)
     
     # Narrative
     if len(crosstab) > 0:
@@ -247,7 +342,7 @@ def render_crosstab_analysis(df: pl.DataFrame, categorical_cols: List[str]):
                 "layers", "blue"
             ), unsafe_allow_html=True)
 
-def render_time_analysis(df: pl.DataFrame, date_col: str, categorical_cols: List[str]):
+def render_time_analysis(df: pl.DataFrame, date_col: str, categorical_cols: List[str], df_key: str):
     """Render user-defined time series analysis."""
     st.subheader("Time Series Analysis")
     
@@ -257,13 +352,7 @@ def render_time_analysis(df: pl.DataFrame, date_col: str, categorical_cols: List
         
     # Attempt to parse date if string
     try:
-        if df[date_col].dtype == pl.Utf8:
-            # Simple optimistic parsing
-            temp_df = df.with_columns(pl.col(date_col).str.to_date(strict=False).alias('_parsed_date'))
-        else:
-            temp_df = df.with_columns(pl.col(date_col).alias('_parsed_date'))
-            
-        temp_df = temp_df.filter(pl.col('_parsed_date').is_not_null())
+        temp_df = _parsed_dates(df, df_key, date_col)
     except Exception as e:
         st.error(f"Could not parse date column: {e}")
         return
@@ -280,21 +369,16 @@ def render_time_analysis(df: pl.DataFrame, date_col: str, categorical_cols: List
     else:
         trunc_str = "1mo"
         
-    # Build query
+    # Build query (plain to_pandas here: px.line cannot plot Arrow date32 columns)
     if group_col != "None":
         time_data = (
-            temp_df.sort('_parsed_date')
-            .group_by_dynamic('_parsed_date', every=trunc_str, by=[group_col])
-            .agg(pl.count().alias('count'))
+            temp_df.group_by_dynamic('_parsed_date', every=trunc_str, by=[group_col])
+            .agg(pl.len().alias('count'))
         )
-        fig = px.line(time_data.to_pandas(), x='_parsed_date', y='count', color=group_col, title="Volume Over Time")
+        fig = px.line(time_data.to_pandas(), x='_parsed_date', y='count', color=group_col, title="Volume Over Time", render_mode='webgl')
     else:
-        time_data = (
-            temp_df.sort('_parsed_date')
-            .group_by_dynamic('_parsed_date', every=trunc_str)
-            .agg(pl.count().alias('count'))
-        )
-        fig = px.line(time_data.to_pandas(), x='_parsed_date', y='count', title="Volume Over Time")
+        time_data = _temporal_agg(df, df_key, date_col, trunc_str).select('_parsed_date', pl.col('records').alias('count'))
+        fig = px.line(time_data.to_pandas(), x='_parsed_date', y='count', title="Volume Over Time", render_mode='webgl')
         
     st.plotly_chart(fig, use_container_width=True)
     
@@ -349,16 +433,24 @@ def render_time_analysis(df: pl.DataFrame, date_col: str, categorical_cols: List
                     "activity", "blue"
                 ), unsafe_allow_html=True)
 
-def render_summary_infographic(df: pl.DataFrame, categorical_cols: List[str], numerical_cols: List[str], date_col: str):
+def render_summary_infographic(df: pl.DataFrame, categorical_cols: List[str], numerical_cols: List[str], date_col: str, df_key: str):
     """Render a rich, non-redundant executive summary."""
     st.markdown(section_header("Executive Summary", "sparkles", "Automated Intelligence & Impact Analysis"), unsafe_allow_html=True)
     
     # 1. Data Health DNA (Non-redundant)
     # Focus on quality metrics not shown in the header
     row_count = len(df)
-    completeness = 100 - (df.null_count().sum(axis=1).sum() / (row_count * len(df.columns)) * 100)
-    duplicates = df.is_duplicated().sum()
+    
+    # Per-column null counts and the distinct-row count from one query; rows
+    # beyond the distinct count are the redundant copies
+    *null_counts, distinct_rows = df.select(
+        pl.all().null_count(),
+        pl.struct(pl.all()).n_unique().alias('__distinct_rows__'),
+    ).row(0)
+    duplicates = row_count - distinct_rows
+    completeness = 100 - (sum(null_counts) / (row_count * len(df.columns)) * 100)
     dup_pct = (duplicates / row_count) * 100
+    sparse_cols = [c for c, n in zip(df.columns, null_counts) if n > row_count * 0.5]
     
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -370,7 +462,6 @@ def render_summary_infographic(df: pl.DataFrame, categorical_cols: List[str], nu
             st.markdown(success_card("Clean Data", "No duplicates detected (100% unique records)."), unsafe_allow_html=True)
     with col3:
         # Sparsity check
-        sparse_cols = [c for c in df.columns if df[c].null_count() > row_count * 0.5]
         if sparse_cols:
              st.markdown(warning_card("Sparsity Alert", f"**{len(sparse_cols)}** columns are >50% empty."), unsafe_allow_html=True)
         else:
@@ -398,7 +489,7 @@ def render_summary_infographic(df: pl.DataFrame, categorical_cols: List[str], nu
                 top_segment = agg_df.row(0)
                 seg_name = top_segment[0]
                 seg_val = top_segment[1]
-                seg_share = (seg_val / df[target_num].sum()) * 100
+                seg_share = (seg_val / agg_df['total'].sum()) * 100
                 
                 st.markdown(f"**Top {cat} by Volume**")
                 st.markdown(f"<h3 style='color:#2563eb;margin:0'>{seg_name}</h3>", unsafe_allow_html=True)
@@ -418,17 +509,8 @@ def render_summary_infographic(df: pl.DataFrame, categorical_cols: List[str], nu
     if date_col and date_col != "None":
         st.subheader("📈 Temporal Pulse")
         try:
-            # Parse date
-            if df[date_col].dtype == pl.Utf8:
-                date_df = df.with_columns(pl.col(date_col).str.to_date(strict=False).alias('_d')).drop_nulls('_d')
-            else:
-                date_df = df.with_columns(pl.col(date_col).alias('_d')).drop_nulls('_d')
-            
             # Aggregate by month for trend
-            trend = date_df.sort('_d').group_by_dynamic('_d', every='1mo').agg(
-                pl.count().alias('records'),
-                pl.sum(numerical_cols[0]).alias('value') if numerical_cols else pl.count().alias('value')
-            )
+            trend = _temporal_agg(df, df_key, date_col, '1mo', numerical_cols[0] if numerical_cols else None)
             
             # Find Peak
             peak_row = trend.sort('value', descending=True).row(0)
@@ -446,7 +528,7 @@ def render_summary_infographic(df: pl.DataFrame, categorical_cols: List[str], nu
                 ), unsafe_allow_html=True)
             with c2:
                 # Sparkline
-                st.area_chart(trend.to_pandas().set_index('_d')['value'], color="#059669", height=150)
+                st.area_chart(trend.tail(SPARKLINE_POINTS).to_pandas().set_index('_parsed_date')['value'], color="#059669", height=150)
                 
         except Exception as e:
             st.warning(f"Could not render timeline: {e}")
@@ -456,7 +538,7 @@ def render_summary_infographic(df: pl.DataFrame, categorical_cols: List[str], nu
         st.divider()
         st.subheader("🔗 Correlation Radar")
         
-        corr_val = df.select(pl.corr(numerical_cols[0], numerical_cols[1])).item(0, 0)
+        corr_val = _correlations(df, df_key, tuple(numerical_cols))[(numerical_cols[0], numerical_cols[1])]
         strong = abs(corr_val) > 0.7
         relation = "Positive" if corr_val > 0 else "Negative"
         
@@ -468,8 +550,10 @@ def render_summary_infographic(df: pl.DataFrame, categorical_cols: List[str], nu
             st.info(msg)
 
 
-def render_generic_analysis(df: pl.DataFrame):
+def render_generic_analysis(df: pl.DataFrame, config: Optional[Dict[str, Any]] = None):
     """Main entry point for Generic Analysis."""
+    config = config or {}
+    df_key = config.get('df_key') or str(df.hash_rows().sum())
     
     # Variable selection in sidebar is handled in app.py, but we can also do it here if needed.
     # For now, let's assume we pass the configuration or let user select here.
@@ -478,9 +562,10 @@ def render_generic_analysis(df: pl.DataFrame):
     with st.expander("Analysis Configuration", expanded=True):
         all_cols = df.columns
         
-        # Guess types
-        num_cols = [c for c in all_cols if df[c].dtype in [pl.Int64, pl.Float64, pl.Int32, pl.Float32]]
-        cat_cols = [c for c in all_cols if c not in num_cols]
+        # Guess types from the schema; no column data is touched
+        schema = df.schema
+        num_cols = [c for c, dtype in schema.items() if dtype.is_numeric()]
+        cat_cols = [c for c, dtype in schema.items() if not dtype.is_numeric()]
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -496,14 +581,14 @@ def render_generic_analysis(df: pl.DataFrame):
     tab0, tab1, tab2, tab3, tab4 = st.tabs(["Summary", "Overview", "Trends", "Distribution", "Cross-Tab"])
     
     with tab0:
-        render_summary_infographic(df, selected_cat, selected_num, selected_date)
+        render_summary_infographic(df, selected_cat, selected_num, selected_date, df_key)
 
     with tab1:
-        render_overview(df, selected_cat, selected_num)
+        render_overview(df, selected_cat, selected_num, df_key)
         
     with tab2:
         if selected_date != "None":
-            render_time_analysis(df, selected_date, selected_cat)
+            render_time_analysis(df, selected_date, selected_cat, df_key)
         else:
             st.info("Select a Date Column to view time trends.")
             
@@ -6,40 +6,32 @@ Prioritized action plan with icons
 import streamlit as st
 import polars as pl
 from typing import Dict, Any, List
-import sys
-import os
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import COLORS
 from utils.data_processor import DataProcessor
 from assets.icons import section_header, icon_text, info_card, success_card, warning_card, error_card, metric_card
 
 
-def render_recommendations(df: pl.DataFrame, config: Dict[str, Any]):
-    """Render the Recommendations module."""
-    
-    # Section header with icon
-    st.markdown(section_header("Recommendations", "target", "Prioritized action plan with impact estimates"), unsafe_allow_html=True)
-    
-    processor = DataProcessor(df)
-    total_cases = len(df)
+@st.cache_data(show_spinner=False, max_entries=4)
+def _recommendation_plan(_df: pl.DataFrame, df_key: str) -> Dict[str, Any]:
+    """Derive the recommendation list and its totals once per loaded frame."""
+    processor = DataProcessor(_df)
+    total_cases = len(_df)
     
-    subcat_col = processor.get_column('subcategory')
-    cat_col = processor.get_column('category')
-    partner_col = processor.get_column('partner')
-    issue_col = subcat_col if subcat_col else cat_col
+    issue_col = processor.get_column('issue')
     
-    # Get top issue
+    # Top issue and Sky count from one pass
+    summary = processor.combined_summary(issue_col)
     top_issue = 'Unknown Issue'
     top_issue_count = 0
-    if issue_col and issue_col in df.columns:
-        top_issues = processor.get_top_n(issue_col, 1)
-        if len(top_issues) > 0:
-            top_issue = str(top_issues[issue_col][0])
-            top_issue_count = int(top_issues['count'][0])
+    if summary['top_issue'] is not None:
+        top_issue = str(summary['top_issue'])
+        top_issue_count = int(summary['top_issue_count'])
+    sky_count = summary['sky_count']
     
-    # Get Sky count
-    sky_count = processor.get_sky_partner_count() if partner_col else 0
+    # Projected cases removed by the two data-driven fixes
+    top_issue_cut = top_issue_count * 0.7
+    sky_cut = sky_count * 0.8
     
     # Build recommendations
     recommendations: List[Dict] = [
@@ -48,16 +40,16 @@ def render_recommendations(df: pl.DataFrame, config: Dict[str, Any]):
             'action': f'Fix "{top_issue}"',
             'detail': 'Address the highest-volume issue with targeted fix based on root cause analysis',
             'effort': '2-3 weeks',
-            'reduction': int(top_issue_count * 0.7),
-            'reduction_pct': round(top_issue_count * 0.7 / total_cases * 100, 1) if total_cases > 0 else 0
+            'reduction': int(top_issue_cut),
+            'reduction_pct': round(top_issue_cut / total_cases * 100, 1) if total_cases > 0 else 0
         },
         {
             'priority': 'P0',
             'action': 'Sky API Integration Rewrite',
             'detail': 'Partner Engineering handshake and sync overhaul',
             'effort': '3-4 weeks',
-            'reduction': int(sky_count * 0.8),
-            'reduction_pct': round(sky_count * 0.8 / total_cases * 100, 1) if total_cases > 0 else 0
+            'reduction': int(sky_cut),
+            'reduction_pct': round(sky_cut / total_cases * 100, 1) if total_cases > 0 else 0
         },
         {
             'priority': 'P1',
@@ -86,9 +78,30 @@ def render_recommendations(df: pl.DataFrame, config: Dict[str, Any]):
     ]
     
     # Summary
-    total_reduction = sum([r['reduction'] for r in recommendations])
+    total_reduction = sum(r['reduction'] for r in recommendations)
     pct_reduction = round(total_reduction / total_cases * 100, 1) if total_cases > 0 else 0
     
+    return {
+        'total_cases': total_cases,
+        'recommendations': recommendations,
+        'total_reduction': total_reduction,
+        'pct_reduction': pct_reduction
+    }
+
+
+def render_recommendations(df: pl.DataFrame, config: Dict[str, Any]):
+    """Render the Recommendations module."""
+    
+    # Section header with icon
+    st.markdown(section_header("Recommendations", "target", "Prioritized action plan with impact estimates"), unsafe_allow_html=True)
+    
+    df_key = config.get('df_key') or str(df.hash_rows().sum())
+    plan = _recommendation_plan(df, df_key)
+    total_cases = plan['total_cases']
+    recommendations = plan['recommendations']
+    total_reduction = plan['total_reduction']
+    pct_reduction = plan['pct_reduction']
+    
     col1, col2, col3 = st.columns(3)
     with col1:
         st.markdown(metric_card(f"{total_cases:,}", "Total Cases", "users"), unsafe_allow_html=True)
@@ -5,30 +5,40 @@ Market-by-market detailed analysis
 
 import streamlit as st
 import polars as pl
+from types import MappingProxyType
 from typing import Dict, Any
-import sys
-import os
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import COLORS
 from utils.visualizations import ChartBuilder
 from utils.data_processor import DataProcessor
+from utils.text_analytics import keyword_dispatch
+from assets.icons import metric_card, metric_grid
+
+
+RECOMMENDATION_TEMPLATES = MappingProxyType({
+    'auth': "Deploy SMS-based password reset for {country}. Extend token validity to 24hrs.",
+    'ux': "Redesign cancellation UX for {country}. Add prominent 'Manage Subscription' button.",
+    'billing': "Implement proactive billing notifications 48hrs before charge for {country}.",
+    'sky': "Escalate Sky API integration fix to Partner Engineering for {country}.",
+    'faq': "Create localized FAQ targeting top 3 issues for {country}.",
+})
+
+# Checked in order against the issue name, before the Sky share
+_RECOMMENDATION_DISPATCH = keyword_dispatch((
+    ('auth', ('password', 'login', 'email')),
+    ('ux', ('cancel',)),
+    ('billing', ('bill', 'charge', 'refund')),
+))
 
 
 def get_recommendation(top_issue: str, sky_pct: float, country: str) -> str:
     """Generate recommendation based on issue and context."""
-    issue = top_issue.lower() if top_issue else ''
-    
-    if 'password' in issue or 'login' in issue or 'email' in issue:
-        return f"Deploy SMS-based password reset for {country}. Extend token validity to 24hrs."
-    elif 'cancel' in issue:
-        return f"Redesign cancellation UX for {country}. Add prominent 'Manage Subscription' button."
-    elif 'bill' in issue or 'charge' in issue or 'refund' in issue:
-        return f"Implement proactive billing notifications 48hrs before charge for {country}."
-    elif sky_pct > 5:
-        return f"Escalate Sky API integration fix to Partner Engineering for {country}."
+    match = _RECOMMENDATION_DISPATCH.match(top_issue or '')
+    if match:
+        key = match.lastgroup
     else:
-        return f"Create localized FAQ targeting top 3 issues for {country}."
+        key = 'sky' if sky_pct > 5 else 'faq'
+    return RECOMMENDATION_TEMPLATES[key].format(country=country)
 
 
 def render_regional_deep_dive(df: pl.DataFrame, config: Dict[str, Any]):
@@ -37,14 +47,11 @@ def render_regional_deep_dive(df: pl.DataFrame, config: Dict[str, Any]):
     st.header("Regional Deep Dive")
     st.caption("Market-by-market detailed analysis")
     
-    processor = DataProcessor(df)
+    processor = config.get('processor') or DataProcessor(df)
     total_cases = len(df)
     
     country_col = processor.get_column('country')
-    subcat_col = processor.get_column('subcategory')
-    cat_col = processor.get_column('category')
-    partner_col = processor.get_column('partner')
-    issue_col = subcat_col if subcat_col else cat_col
+    issue_col = processor.get_column('issue')
     
     if not country_col:
         st.error("Country column not found in dataset.")
@@ -58,45 +65,37 @@ def render_regional_deep_dive(df: pl.DataFrame, config: Dict[str, Any]):
         st.warning("No country data available.")
         return
     
-    # Calculate global average
-    unique_countries = df[country_col].n_unique()
-    avg_per_country = total_cases / unique_countries if unique_countries > 0 else 0
-    
     # Country selector
     country_list = top_countries[country_col].to_list()
     selected_country = st.selectbox("Select Market", country_list, key="regional_country")
     
-    # Filter to selected country
-    country_df = df.filter(pl.col(country_col) == selected_country)
-    country_volume = len(country_df)
+    # Every country metric and the issue table come from the processor's
+    # country x issue rollup, so changing the market never rescans the rows
+    rollup = processor.country_rollup()
+    country_rows = rollup.filter(pl.col(country_col) == selected_country)
+    
+    unique_countries = processor.get_cardinality(country_col)
+    avg_per_country = total_cases / unique_countries if unique_countries > 0 else 0
+    
+    country_volume = int(country_rows.get_column('volume').sum())
     country_pct = round(country_volume / total_cases * 100, 2)
     
     # Calculate vs global average
     vs_avg = round((country_volume / avg_per_country - 1) * 100, 1) if avg_per_country > 0 else 0
     vs_avg_label = f"+{vs_avg}% above avg" if vs_avg > 0 else f"{abs(vs_avg)}% below avg"
     
-    # Sky presence
-    sky_count = 0
-    if partner_col and partner_col in country_df.columns:
-        sky_count = len(country_df.filter(
-            pl.col(partner_col).is_not_null() &
-            pl.col(partner_col).str.to_lowercase().str.contains('sky')
-        ))
+    sky_count = int(country_rows.get_column('sky_volume').sum())
     sky_pct = round(sky_count / country_volume * 100, 2) if country_volume > 0 else 0
-
     
     st.divider()
     
-    # Metrics row
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.metric(f"{selected_country} Volume", f"{country_volume:,}")
-    with col2:
-        st.metric("% of Global", f"{country_pct:.1f}%")
-    with col3:
-        st.metric("vs Global Avg", vs_avg_label)
-    with col4:
-        st.metric("Sky Impact", f"{sky_pct:.1f}%")
+    # Metrics row - one grid element instead of four columns
+    st.markdown(metric_grid([
+        metric_card(f"{country_volume:,}", f"{selected_country} Volume", "users"),
+        metric_card(f"{country_pct:.1f}%", "% of Global", "globe"),
+        metric_card(vs_avg_label, "vs Global Avg", "trending"),
+        metric_card(f"{sky_pct:.1f}%", "Sky Impact", "partner"),
+    ]), unsafe_allow_html=True)
     
     st.divider()
     
@@ -106,23 +105,24 @@ def render_regional_deep_dive(df: pl.DataFrame, config: Dict[str, Any]):
     top_issue = 'Unknown'
     top_issue_pct = 0
     
-    if issue_col:
+    if issue_col in country_rows.columns:
         issues = (
-            country_df
+            country_rows
             .filter(pl.col(issue_col).is_not_null())
-            .group_by(issue_col)
-            .agg(pl.count().alias('volume'))
-            .with_columns([
-                (pl.col('volume') / country_volume * 100).round(2).alias('percentage')
-            ])
+            .select([issue_col, 'volume'])
             .sort('volume', descending=True)
             .head(5)
+            .with_columns([
+                (pl.col('volume') / country_volume * 100).alias('percentage')
+            ])
         )
         
         if len(issues) > 0:
-            display_issues = issues.to_pandas()
-            display_issues.columns = ['Issue', 'Volume', '% of Country']
-            st.dataframe(display_issues, use_container_width=True, hide_index=True)
+            st.dataframe(
+                issues.rename({issue_col: 'Issue', 'volume': 'Volume', 'percentage': '% of Country'}),
+                use_container_width=True, hide_index=True,
+                column_config={'% of Country': st.column_config.NumberColumn(format="%.2f")}
+            )
             
             top_issue = issues[issue_col][0]
             top_issue_pct = issues['percentage'][0]
@@ -5,80 +5,100 @@ Issue severity classification and prioritization
 
 import streamlit as st
 import polars as pl
+from types import MappingProxyType
 from typing import Dict, Any
-import sys
-import os
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import COLORS, SEVERITY_THRESHOLDS
 from utils.visualizations import ChartBuilder
 from utils.data_processor import DataProcessor
+from utils.text_analytics import keyword_dispatch
+from assets.icons import metric_card, metric_grid
+
+
+# Issue class -> keywords, checked in order against the lowercased issue name;
+# anything unmatched is a self-service gap
+ROOT_CAUSE_RULES = (
+    ('auth', ('password', 'login', 'email')),
+    ('ux', ('cancel', 'unsubscribe')),
+    ('billing', ('bill', 'charge', 'refund')),
+    ('partner', ('sky', 'partner', 'provider')),
+)
+_ROOT_CAUSE_DISPATCH = keyword_dispatch(ROOT_CAUSE_RULES)
+
+ROOT_CAUSE_DETAILS = {
+    'auth': {
+        'root_cause': 'Authentication Barrier',
+        'factors': (
+            'Email deliverability issues with major providers',
+            'SSO token expiration too short (15 min)',
+            'Password reset link blocked by spam filters',
+            'No SMS fallback option available'
+        ),
+        'fix': 'Implement SMS-based 2FA with 24hr token validity',
+        'reduction': '70-80%'
+    },
+    'ux': {
+        'root_cause': 'UX Friction',
+        'factors': (
+            'Cancel button hidden in account settings',
+            'Multiple confirmation screens required',
+            'Lack of pause subscription option',
+            'No clear retention offer presented'
+        ),
+        'fix': 'Redesign cancellation flow with 1-click save options',
+        'reduction': '40-50%'
+    },
+    'billing': {
+        'root_cause': 'Payment Gateway Issue',
+        'factors': (
+            'Billing cycle timing confusion',
+            'No proactive charge notifications',
+            'Trial end date unclear to users',
+            'Refund policy not visible in app'
+        ),
+        'fix': 'Send billing reminders 48hrs before charge',
+        'reduction': '50-60%'
+    },
+    'partner': {
+        'root_cause': 'Partner Integration Failure',
+        'factors': (
+            'API handshake errors between systems',
+            'Account linking failures',
+            'Subscription status sync delays',
+            'Partner portal UX limitations'
+        ),
+        'fix': 'Escalate to Partner Engineering for API audit',
+        'reduction': '60-70%'
+    },
+    'self_service': {
+        'root_cause': 'Self-Service Gap',
+        'factors': (
+            'FAQ does not cover this issue',
+            'Chatbot unable to resolve',
+            'Help articles outdated',
+            'No video tutorials available'
+        ),
+        'fix': 'Expand self-service content for this issue category',
+        'reduction': '30-40%'
+    }
+}
+ROOT_CAUSE_DETAILS = MappingProxyType({key: MappingProxyType(detail) for key, detail in ROOT_CAUSE_DETAILS.items()})
+
+
+def classify_issue_expr(issue_col: str) -> pl.Expr:
+    """Tag each issue with its ROOT_CAUSE_DETAILS key in one vectorized pass."""
+    issue = pl.col(issue_col).cast(pl.Utf8).str.to_lowercase()
+    expr = None
+    for rc_class, keywords in ROOT_CAUSE_RULES:
+        matched = issue.str.contains('|'.join(keywords))
+        expr = (pl.when(matched) if expr is None else expr.when(matched)).then(pl.lit(rc_class))
+    return expr.otherwise(pl.lit('self_service')).alias('rc_class')
 
 
 def get_root_cause_detail(issue_name: str) -> Dict[str, Any]:
     """Get detailed root cause analysis for an issue."""
-    issue = issue_name.lower() if issue_name else ''
-    
-    if 'password' in issue or 'login' in issue or 'email' in issue:
-        return {
-            'root_cause': 'Authentication Barrier',
-            'factors': [
-                'Email deliverability issues with major providers',
-                'SSO token expiration too short (15 min)',
-                'Password reset link blocked by spam filters',
-                'No SMS fallback option available'
-            ],
-            'fix': 'Implement SMS-based 2FA with 24hr token validity',
-            'reduction': '70-80%'
-        }
-    elif 'cancel' in issue or 'unsubscribe' in issue:
-        return {
-            'root_cause': 'UX Friction',
-            'factors': [
-                'Cancel button hidden in account settings',
-                'Multiple confirmation screens required',
-                'Lack of pause subscription option',
-                'No clear retention offer presented'
-            ],
-            'fix': 'Redesign cancellation flow with 1-click save options',
-            'reduction': '40-50%'
-        }
-    elif 'bill' in issue or 'charge' in issue or 'refund' in issue:
-        return {
-            'root_cause': 'Payment Gateway Issue',
-            'factors': [
-                'Billing cycle timing confusion',
-                'No proactive charge notifications',
-                'Trial end date unclear to users',
-                'Refund policy not visible in app'
-            ],
-            'fix': 'Send billing reminders 48hrs before charge',
-            'reduction': '50-60%'
-        }
-    elif 'sky' in issue or 'partner' in issue or 'provider' in issue:
-        return {
-            'root_cause': 'Partner Integration Failure',
-            'factors': [
-                'API handshake errors between systems',
-                'Account linking failures',
-                'Subscription status sync delays',
-                'Partner portal UX limitations'
-            ],
-            'fix': 'Escalate to Partner Engineering for API audit',
-            'reduction': '60-70%'
-        }
-    else:
-        return {
-            'root_cause': 'Self-Service Gap',
-            'factors': [
-                'FAQ does not cover this issue',
-                'Chatbot unable to resolve',
-                'Help articles outdated',
-                'No video tutorials available'
-            ],
-            'fix': 'Expand self-service content for this issue category',
-            'reduction': '30-40%'
-        }
+    match = _ROOT_CAUSE_DISPATCH.match(issue_name or '')
+    return ROOT_CAUSE_DETAILS[match.lastgroup if match else 'self_service']
 
 
 def render_root_cause_analysis(df: pl.DataFrame, config: Dict[str, Any]):
@@ -87,65 +107,69 @@ def render_root_cause_analysis(df: pl.DataFrame, config: Dict[str, Any]):
     st.header("Root Cause Analysis")
     st.caption("Issue severity classification and prioritization")
     
-    processor = DataProcessor(df)
+    processor = config.get('processor') or DataProcessor(df)
     total_cases = len(df)
     
-    subcat_col = processor.get_column('subcategory')
-    cat_col = processor.get_column('category')
-    issue_col = subcat_col if subcat_col else cat_col
+    issue_col = processor.get_column('issue')
     
     if not issue_col:
         st.warning("No category or sub-category column found in dataset.")
         st.info("Ensure your data has a Category or Sub-Category column.")
         return
     
-    # Get issue distribution with severity
+    # Get issue distribution with severity classification in one plan
     issues = (
-        df
+        df.lazy()
         .filter(pl.col(issue_col).is_not_null())
-        .group_by(issue_col)
-        .agg(pl.count().alias('volume'))
+        .select(pl.col(issue_col).value_counts(sort=True))
+        .unnest(issue_col)
+        .rename({'count': 'volume'})
+        .with_columns([
+            (pl.col('volume') / total_cases * 100).alias('pct_impact'),
+            # Running volume down the sorted table; row 3 is the top-3 total
+            pl.col('volume').cum_sum().alias('cum_volume')
+        ])
         .with_columns([
-            (pl.col('volume') / total_cases * 100).round(2).alias('pct_impact')
+            pl.when(pl.col('pct_impact') > SEVERITY_THRESHOLDS['critical']).then(pl.lit('CRITICAL'))
+            .when(pl.col('pct_impact') > SEVERITY_THRESHOLDS['high']).then(pl.lit('HIGH'))
+            .when(pl.col('pct_impact') > SEVERITY_THRESHOLDS['medium']).then(pl.lit('MEDIUM'))
+            .otherwise(pl.lit('LOW'))
+            .alias('severity')
         ])
-        .sort('volume', descending=True)
+        # The null filter streams in chunks, so the full-length filtered issue
+        # column is never materialised; CSE is off as streaming does not support it
+        .collect(streaming=True, comm_subplan_elim=False)
     )
     
-    # Add severity classification
-    issues = issues.with_columns([
-        pl.when(pl.col('pct_impact') > SEVERITY_THRESHOLDS['critical']).then(pl.lit('CRITICAL'))
-        .when(pl.col('pct_impact') > SEVERITY_THRESHOLDS['high']).then(pl.lit('HIGH'))
-        .when(pl.col('pct_impact') > SEVERITY_THRESHOLDS['medium']).then(pl.lit('MEDIUM'))
-        .otherwise(pl.lit('LOW'))
-        .alias('severity')
-    ])
-    
-    # Summary metrics
-    critical_count = len(issues.filter(pl.col('severity') == 'CRITICAL'))
-    high_count = len(issues.filter(pl.col('severity') == 'HIGH'))
-    top_3_volume = issues.head(3)['volume'].sum()
+    # Summary metrics, read from the issue table in a single select
+    critical_count, high_count, top_3_volume = issues.select(
+        (pl.col('severity') == 'CRITICAL').sum(),
+        (pl.col('severity') == 'HIGH').sum().alias('high'),
+        pl.col('cum_volume').head(3).last().fill_null(0),
+    ).row(0)
     top_3_pct = round(top_3_volume / total_cases * 100, 1)
     
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.metric("Critical Issues", critical_count)
-    with col2:
-        st.metric("High Priority Issues", high_count)
-    with col3:
-        st.metric("Top 3 Issues Volume", f"{top_3_volume:,}")
-    with col4:
-        st.metric("Top 3 Concentration", f"{top_3_pct}%")
+    st.markdown(metric_grid([
+        metric_card(str(critical_count), "Critical Issues", "alert"),
+        metric_card(str(high_count), "High Priority Issues", "target"),
+        metric_card(f"{top_3_volume:,}", "Top 3 Issues Volume", "bar_chart"),
+        metric_card(f"{top_3_pct}%", "Top 3 Concentration", "pie_chart"),
+    ]), unsafe_allow_html=True)
     
     st.divider()
     
     # Issue table
     st.subheader("Issue Prioritization Matrix")
     
-    display_df = issues.head(15).to_pandas()
-    display_df.columns = ['Issue', 'Volume', '% Impact', 'Severity']
-    display_df['Volume'] = display_df['Volume'].map(lambda x: f"{x:,}")
+    display_df = issues.head(15).drop('cum_volume').with_columns(
+        pl.col('volume').map_elements(lambda x: f"{x:,}", return_dtype=pl.Utf8)
+    ).rename({issue_col: 'Issue', 'volume': 'Volume', 'pct_impact': '% Impact', 'severity': 'Severity'})
     
-    st.dataframe(display_df, use_container_width=True, hide_index=True)
+    # Percentages stay unrounded; the column format handles display
+    st.dataframe(
+        display_df, use_container_width=True, hide_index=True,
+        column_config={'% Impact': st.column_config.NumberColumn(format="%.2f")}
+    )
     
     st.divider()
     
@@ -153,13 +177,14 @@ def render_root_cause_analysis(df: pl.DataFrame, config: Dict[str, Any]):
     st.subheader("Root Cause Deep Dive")
     st.caption("Detailed analysis of top 3 issues with recommended fixes")
     
-    for idx, row in enumerate(issues.head(3).iter_rows(named=True)):
+    top_issues = issues.head(3).with_columns(classify_issue_expr(issue_col))
+    for idx, row in enumerate(top_issues.to_dicts()):
         issue_name = row[issue_col]
         volume = row['volume']
         pct = row['pct_impact']
         severity = row['severity']
         
-        detail = get_root_cause_detail(issue_name)
+        detail = ROOT_CAUSE_DETAILS[row['rc_class']]
         
         with st.expander(f"**#{idx+1} {issue_name}** - {volume:,} cases ({pct:.1f}%) - {severity}"):
             col1, col2 = st.columns(2)
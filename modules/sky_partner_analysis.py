@@ -5,32 +5,49 @@ Two-level analysis of Sky partner integrations
 
 import streamlit as st
 import polars as pl
+from types import MappingProxyType
 from typing import Dict, Any
-import sys
-import os
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import COLORS
 from utils.visualizations import ChartBuilder
 from utils.data_processor import DataProcessor
+from utils.text_analytics import keyword_dispatch
+from assets.icons import metric_card, metric_grid
+
+
+# Root cause key -> keywords, checked in order against the lowercased issue name
+ROOT_CAUSE_RULES = (
+    ('auth', ('password', 'email', 'login')),
+    ('partner', ('sky', 'provider')),
+    ('ux', ('cancel',)),
+    ('billing', ('bill', 'refund', 'charge')),
+    ('technical', ('stream', 'play', 'buffer')),
+)
+ROOT_CAUSES = MappingProxyType({
+    'auth': "Authentication Barrier: Email deliverability failure or SSO token expiration",
+    'partner': "Partner Integration: API handshake error between Sky and Paramount+ systems",
+    'ux': "UX Friction: Cancellation flow hidden or requires partner portal navigation",
+    'billing': "Payment Gateway: Billing cycle timing mismatch between partner and platform",
+    'technical': "Technical: Content delivery or streaming quality issues",
+})
+DEFAULT_ROOT_CAUSE = "Process Friction: Self-service gap requiring manual intervention"
+_ROOT_CAUSE_DISPATCH = keyword_dispatch(ROOT_CAUSE_RULES)
+
+
+def root_cause_expr(issue_col: str) -> pl.Expr:
+    """Label each issue with its root cause in one vectorized pass."""
+    issue = pl.col(issue_col).cast(pl.Utf8).str.to_lowercase()
+    expr = None
+    for key, keywords in ROOT_CAUSE_RULES:
+        matched = issue.str.contains('|'.join(keywords))
+        expr = (pl.when(matched) if expr is None else expr.when(matched)).then(pl.lit(ROOT_CAUSES[key]))
+    return expr.otherwise(pl.lit(DEFAULT_ROOT_CAUSE)).alias('root_cause')
 
 
 def analyze_root_cause(issue_name: str) -> str:
     """Generate root cause analysis based on issue type."""
-    issue = issue_name.lower() if issue_name else ''
-    
-    if 'password' in issue or 'email' in issue or 'login' in issue:
-        return "Authentication Barrier: Email deliverability failure or SSO token expiration"
-    elif 'sky' in issue or 'provider' in issue:
-        return "Partner Integration: API handshake error between Sky and Paramount+ systems"
-    elif 'cancel' in issue:
-        return "UX Friction: Cancellation flow hidden or requires partner portal navigation"
-    elif 'bill' in issue or 'refund' in issue or 'charge' in issue:
-        return "Payment Gateway: Billing cycle timing mismatch between partner and platform"
-    elif 'stream' in issue or 'play' in issue or 'buffer' in issue:
-        return "Technical: Content delivery or streaming quality issues"
-    else:
-        return "Process Friction: Self-service gap requiring manual intervention"
+    match = _ROOT_CAUSE_DISPATCH.match(issue_name or '')
+    return ROOT_CAUSES[match.lastgroup] if match else DEFAULT_ROOT_CAUSE
 
 
 def render_sky_partner_analysis(df: pl.DataFrame, config: Dict[str, Any]):
@@ -39,7 +56,7 @@ def render_sky_partner_analysis(df: pl.DataFrame, config: Dict[str, Any]):
     st.header("Sky Partner Analysis")
     st.caption("Two-level analysis of Sky partner integrations")
     
-    processor = DataProcessor(df)
+    processor = config.get('processor') or DataProcessor(df)
     
     # Filter to Sky partners
     sky_df = processor.filter_sky_partners()
@@ -53,51 +70,83 @@ def render_sky_partner_analysis(df: pl.DataFrame, config: Dict[str, Any]):
     sky_cases = len(sky_df)
     sky_pct = round(sky_cases / total_cases * 100, 2)
     
-    # Summary metrics
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("Sky Partner Cases", f"{sky_cases:,}")
-    with col2:
-        st.metric("% of Total Volume", f"{sky_pct:.1f}%")
-    with col3:
-        potential_reduction = int(sky_cases * 0.7)
-        st.metric("Reduction Potential (70%)", f"{potential_reduction:,} cases")
+    # Summary metrics - one grid element instead of three columns
+    potential_reduction = int(sky_cases * 0.7)
+    st.markdown(metric_grid([
+        metric_card(f"{sky_cases:,}", "Sky Partner Cases", "partner"),
+        metric_card(f"{sky_pct:.1f}%", "% of Total Volume", "pie_chart"),
+        metric_card(f"{potential_reduction:,} cases", "Reduction Potential (70%)", "zap"),
+    ]), unsafe_allow_html=True)
     
     st.divider()
     
-    # Level 1: Market Overview
-    st.subheader("Level 1: Market Overview")
-    
     country_col = processor.get_column('country')
     partner_col = processor.get_column('partner')
+    issue_col = processor.get_column('issue')
     
+    # Both levels aggregate the Sky rows; plan them together and collect in one go
+    sky_lf = sky_df.lazy()
+    queries = {}
     if country_col and partner_col:
-        # Group by country and partner
-        market_df = (
-            sky_df
+        # Group by country and partner, with impact rating
+        queries['market'] = (
+            sky_lf
             .group_by([country_col, partner_col])
-            .agg(pl.count().alias('volume'))
+            .agg(pl.len().alias('volume'))
             .with_columns([
-                (pl.col('volume') / sky_cases * 100).round(2).alias('pct_of_sky'),
-                (pl.col('volume') / total_cases * 100).round(2).alias('pct_of_global')
+                (pl.col('volume') / sky_cases * 100).alias('pct_of_sky'),
+                (pl.col('volume') / total_cases * 100).alias('pct_of_global')
+            ])
+            .with_columns([
+                pl.when(pl.col('pct_of_global') > 3).then(pl.lit('HIGH'))
+                .otherwise(pl.lit('MEDIUM'))
+                .alias('impact')
             ])
             .sort('volume', descending=True)
         )
-        
-        # Add impact rating
-        market_df = market_df.with_columns([
-            pl.when(pl.col('pct_of_global') > 3).then(pl.lit('HIGH'))
-            .otherwise(pl.lit('MEDIUM'))
-            .alias('impact')
-        ])
+    if issue_col:
+        # Top issues for Sky cases, with severity
+        queries['issues'] = (
+            sky_lf
+            .filter(pl.col(issue_col).is_not_null())
+            .select(pl.col(issue_col).value_counts(sort=True))
+            .unnest(issue_col)
+            .rename({'count': 'volume'})
+            .head(10)
+            .with_columns([
+                (pl.col('volume') / sky_cases * 100).alias('pct_of_sky')
+            ])
+            .with_columns([
+                pl.when(pl.col('pct_of_sky') > 30).then(pl.lit('CRITICAL'))
+                .when(pl.col('pct_of_sky') > 15).then(pl.lit('HIGH'))
+                .otherwise(pl.lit('MEDIUM'))
+                .alias('severity'),
+                root_cause_expr(issue_col)
+            ])
+        )
+    results = dict(zip(queries, pl.collect_all(list(queries.values()))))
+    
+    # Level 1: Market Overview
+    st.subheader("Level 1: Market Overview")
+    
+    if 'market' in results:
+        market_df = results['market']
         
         col1, col2 = st.columns([2, 1])
         
         with col1:
             # Display table
-            display_df = market_df.head(10).to_pandas()
-            display_df.columns = ['Country', 'Partner', 'Volume', '% of Sky', '% of Global', 'Impact']
-            st.dataframe(display_df, use_container_width=True, hide_index=True)
+            display_df = market_df.head(10).rename({
+                country_col: 'Country', partner_col: 'Partner', 'volume': 'Volume',
+                'pct_of_sky': '% of Sky', 'pct_of_global': '% of Global', 'impact': 'Impact'
+            })
+            st.dataframe(
+                display_df, use_container_width=True, hide_index=True,
+                column_config={
+                    '% of Sky': st.column_config.NumberColumn(format="%.2f"),
+                    '% of Global': st.column_config.NumberColumn(format="%.2f"),
+                }
+            )
         
         with col2:
             # Chart
@@ -116,39 +165,16 @@ def render_sky_partner_analysis(df: pl.DataFrame, config: Dict[str, Any]):
     # Level 2: Root Cause Patterns
     st.subheader("Level 2: Root Cause Patterns")
     
-    subcat_col = processor.get_column('subcategory')
-    cat_col = processor.get_column('category')
-    issue_col = subcat_col if subcat_col else cat_col
-    
-    if issue_col:
-        # Top issues for Sky cases
-        issue_df = (
-            sky_df
-            .filter(pl.col(issue_col).is_not_null())
-            .group_by(issue_col)
-            .agg(pl.count().alias('volume'))
-            .with_columns([
-                (pl.col('volume') / sky_cases * 100).round(2).alias('pct_of_sky')
-            ])
-            .sort('volume', descending=True)
-            .head(10)
-        )
-        
-        # Add severity
-        issue_df = issue_df.with_columns([
-            pl.when(pl.col('pct_of_sky') > 30).then(pl.lit('CRITICAL'))
-            .when(pl.col('pct_of_sky') > 15).then(pl.lit('HIGH'))
-            .otherwise(pl.lit('MEDIUM'))
-            .alias('severity')
-        ])
+    if 'issues' in results:
+        issue_df = results['issues']
         
         # Display with root cause
-        for row in issue_df.head(5).iter_rows(named=True):
+        for row in issue_df.head(5).to_dicts():
             issue_name = row[issue_col]
             volume = row['volume']
             pct = row['pct_of_sky']
             severity = row['severity']
-            root_cause = analyze_root_cause(issue_name)
+            root_cause = row['root_cause']
             
             with st.expander(f"**{issue_name}** - {volume:,} cases ({pct:.1f}%) - {severity}"):
                 st.markdown(f"**Root Cause:** {root_cause}")
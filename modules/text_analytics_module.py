@@ -5,15 +5,11 @@ Rich regional insights with narrative analysis
 
 import streamlit as st
 import polars as pl
-from typing import Dict, Any, List, Tuple
-import sys
-import os
+from typing import Dict, Any, List, Tuple, Union
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import COLORS
 from utils.visualizations import ChartBuilder
 from utils.data_processor import DataProcessor
-from utils.text_analytics import TextAnalyzer
 
 
 # Theme definitions with detailed narratives
@@ -61,34 +57,62 @@ THEME_NARRATIVES = {
 }
 
 
+# Lowercased description column; every theme branch matches against it
+DESC_LOWER = '_desc_lower'
+
+
+def lowercase_descriptions(desc_col: str) -> pl.Expr:
+    """Cast and lowercase the description column once, as DESC_LOWER."""
+    return pl.col(desc_col).cast(pl.Utf8).str.to_lowercase().alias(DESC_LOWER)
+
+
+def theme_expr(lower_col: str = DESC_LOWER) -> pl.Expr:
+    """
+    Label each description with its theme in one vectorized pass.
+    
+    The first theme (in THEME_NARRATIVES order) with any keyword in the
+    already lowercased text wins; empty or unmatched descriptions are 'Other'.
+    """
+    text = pl.col(lower_col)
+    expr = None
+    for theme, info in THEME_NARRATIVES.items():
+        matched = text.str.contains_any(info['keywords'])
+        expr = (pl.when(matched) if expr is None else expr.when(matched)).then(pl.lit(theme))
+    return expr.otherwise(pl.lit('Other')).alias('theme')
+
+
+# Built once at import: theme order (for ranking ties and counters) and the
+# matching expression, which only depends on DESC_LOWER
+_THEME_NAMES = tuple(THEME_NARRATIVES)
+_THEME_EXPR = theme_expr()
+# Every keyword in one automaton: rows with no hit at all are 'Other' without
+# running the per-theme chain
+_ANY_THEME_EXPR = pl.col(DESC_LOWER).str.contains_any(
+    [keyword for info in THEME_NARRATIVES.values() for keyword in info['keywords']]
+).fill_null(False)
+
+
 def analyze_region_themes(df: pl.DataFrame, desc_col: str, total_cases: int) -> List[Dict]:
     """Analyze themes for a specific region's data."""
     if len(df) == 0:
         return []
     
-    analyzer = TextAnalyzer()
-    theme_counts = {theme: 0 for theme in THEME_NARRATIVES.keys()}
-    theme_counts['Other'] = 0
-    
-    # Count themes based on keyword matching
-    for row in df.iter_rows(named=True):
-        text = str(row.get(desc_col, '') or '').lower()
-        if not text:
-            theme_counts['Other'] += 1
-            continue
-        
-        matched = False
-        for theme, info in THEME_NARRATIVES.items():
-            for keyword in info['keywords']:
-                if keyword in text:
-                    theme_counts[theme] += 1
-                    matched = True
-                    break
-            if matched:
-                break
-        
-        if not matched:
-            theme_counts['Other'] += 1
+    # Count themes based on keyword matching, entirely inside Polars
+    counts = (
+        df.lazy()
+        .select(lowercase_descriptions(desc_col))
+        .select(_THEME_EXPR)
+        .collect()
+        .get_column('theme')
+        .value_counts()
+    )
+    return rank_themes(dict(zip(counts.get_column('theme').to_list(), counts.get_column('count').to_list())))
+
+
+def rank_themes(counts: Dict[str, int]) -> List[Dict]:
+    """Turn per-theme row counts (including 'Other') into ranked theme entries."""
+    theme_counts = dict.fromkeys(_THEME_NAMES + ('Other',), 0)
+    theme_counts.update(counts)
     
     # Calculate percentages and sort
     total = sum(theme_counts.values())
@@ -112,17 +136,54 @@ def analyze_region_themes(df: pl.DataFrame, desc_col: str, total_cases: int) ->
     return results
 
 
-def get_subcategory_breakdown(df: pl.DataFrame, subcat_col: str, top_n: int = 7) -> pl.DataFrame:
-    """Get sub-category breakdown with counts."""
+@st.cache_data(show_spinner=False, max_entries=4)
+def _region_theme_counts(_df: pl.DataFrame, df_key: str, country_col: str, desc_col: str) -> pl.DataFrame:
+    """Row count per (region, theme) for every region, in one pass over the descriptions."""
+    texts = (
+        _df.lazy()
+        .select([pl.col(country_col).cast(pl.Utf8), lowercase_descriptions(desc_col)])
+        .with_columns(_ANY_THEME_EXPR.alias('_any_theme'))
+    )
+    # Only rows with some keyword need the first-theme-wins chain
+    matched = (
+        texts.filter(pl.col('_any_theme'))
+        .select([pl.col(country_col), _THEME_EXPR])
+        .group_by([country_col, 'theme'])
+        .agg(pl.len().alias('count'))
+    )
+    unmatched = (
+        texts.filter(~pl.col('_any_theme'))
+        .group_by(country_col)
+        .agg(pl.len().alias('count'))
+        .select([pl.col(country_col), pl.lit('Other').alias('theme'), pl.col('count')])
+    )
+    return pl.concat([matched, unmatched]).collect()
+
+
+def _region_themes(theme_counts: pl.DataFrame, country_col: str, region: str) -> Dict[str, Any]:
+    """Volume and ranked themes for one region, read from the precomputed counts."""
+    rows = theme_counts.filter(pl.col(country_col) == region)
+    counts = dict(zip(rows.get_column('theme').to_list(), rows.get_column('count').to_list()))
+    return {
+        'volume': sum(counts.values()),
+        'themes': rank_themes(counts),
+    }
+
+
+def get_subcategory_breakdown(df: Union[pl.DataFrame, pl.LazyFrame], subcat_col: str,
+                              top_n: int = 7) -> pl.DataFrame:
+    """Get sub-category breakdown with counts. A LazyFrame keeps upstream filters in the plan."""
     if subcat_col not in df.columns:
         return pl.DataFrame()
     
     return (
-        df.filter(pl.col(subcat_col).is_not_null())
+        df.lazy()
+        .filter(pl.col(subcat_col).is_not_null())
         .group_by(subcat_col)
-        .agg(pl.count().alias('count'))
+        .agg(pl.len().alias('count'))
         .sort('count', descending=True)
         .head(top_n)
+        .collect()
     )
 
 
@@ -132,15 +193,14 @@ def render_text_analytics(df: pl.DataFrame, config: Dict[str, Any]):
     st.header("Text Analytics")
     st.caption("Regional theme analysis from customer descriptions")
     
-    processor = DataProcessor(df)
+    processor = config.get('processor') or DataProcessor(df)
+    df_key = config.get('df_key') or str(df.hash_rows().sum())
     total_cases = len(df)
     
     desc_col = processor.get_column('description')
     desc_trans_col = processor.get_column('description_translated')
     country_col = processor.get_column('country')
-    subcat_col = processor.get_column('subcategory')
-    cat_col = processor.get_column('category')
-    issue_col = subcat_col if subcat_col else cat_col
+    issue_col = processor.get_column('issue')
     
     # Use best available description column
     analysis_col = desc_col if desc_col else desc_trans_col
@@ -156,14 +216,8 @@ def render_text_analytics(df: pl.DataFrame, config: Dict[str, Any]):
     
     st.divider()
     
-    # Get top regions
-    top_regions = (
-        df.filter(pl.col(country_col).is_not_null())
-        .group_by(country_col)
-        .agg(pl.count().alias('count'))
-        .sort('count', descending=True)
-        .head(10)
-    )
+    # Get top regions (memoised on the shared processor)
+    top_regions = processor.get_top_n(country_col, 10)
     
     if len(top_regions) == 0:
         st.warning("No regional data available.")
@@ -173,9 +227,8 @@ def render_text_analytics(df: pl.DataFrame, config: Dict[str, Any]):
     region_list = [str(r) for r in top_regions[country_col].to_list()]
     selected_region = st.selectbox("Select Region", region_list, key="text_region_select")
     
-    # Filter to selected region
-    region_df = df.filter(pl.col(country_col) == selected_region)
-    region_volume = len(region_df)
+    # The region's volume is already in the top-regions counts
+    region_volume = int(top_regions.filter(pl.col(country_col) == selected_region).get_column('count').sum())
     region_pct = round(region_volume / total_cases * 100, 1)
     
     st.divider()
@@ -188,7 +241,19 @@ def render_text_analytics(df: pl.DataFrame, config: Dict[str, Any]):
     if issue_col:
         st.markdown("**Sub-category Breakdown**")
         
-        subcat_df = get_subcategory_breakdown(region_df, issue_col)
+        # The processor's cached country x issue rollup already holds this
+        # region's counts, so the raw rows are not filtered per selection
+        rollup = processor.country_rollup()
+        if issue_col in rollup.columns and issue_col != country_col:
+            subcat_df = (
+                rollup
+                .filter((pl.col(country_col) == selected_region) & pl.col(issue_col).is_not_null())
+                .select([issue_col, pl.col('volume').alias('count')])
+                .sort('count', descending=True)
+                .head(7)
+            )
+        else:
+            subcat_df = get_subcategory_breakdown(df.lazy().filter(pl.col(country_col) == selected_region), issue_col)
         
         if len(subcat_df) > 0:
             # Calculate percentage
@@ -197,8 +262,7 @@ def render_text_analytics(df: pl.DataFrame, config: Dict[str, Any]):
             ])
             
             # Format for display
-            display_df = subcat_df.to_pandas()
-            display_df.columns = ['Sub-category', selected_region, '%']
+            display_df = subcat_df.rename({issue_col: 'Sub-category', 'count': selected_region, 'pct': '%'})
             st.dataframe(display_df, use_container_width=True, hide_index=True)
     
     st.divider()
@@ -207,7 +271,14 @@ def render_text_analytics(df: pl.DataFrame, config: Dict[str, Any]):
     st.markdown("**Trends by Region based on Description**")
     
     with st.spinner("Analyzing descriptions..."):
-        themes = analyze_region_themes(region_df, analysis_col, region_volume)
+        theme_counts = _region_theme_counts(df, df_key, country_col, analysis_col)
+    
+    # Summaries for the comparison regions, shared with the selected region so it
+    # is not ranked twice when it is one of them
+    summaries = {region: _region_themes(theme_counts, country_col, region) for region in region_list[:5]}
+    if selected_region not in summaries:
+        summaries[selected_region] = _region_themes(theme_counts, country_col, selected_region)
+    themes = summaries[selected_region]['themes']
     
     if not themes:
         st.info("Insufficient description data for theme analysis.")
@@ -233,18 +304,17 @@ def render_text_analytics(df: pl.DataFrame, config: Dict[str, Any]):
         comparison_data = []
         
         for region in region_list[:5]:
-            r_df = df.filter(pl.col(country_col) == region)
-            r_themes = analyze_region_themes(r_df, analysis_col, len(r_df))
+            summary = summaries[region]
             
-            row = {'Region': str(region), 'Volume': len(r_df)}
-            for t in r_themes[:4]:  # Top 4 themes
+            row = {'Region': str(region), 'Volume': summary['volume']}
+            for t in summary['themes'][:4]:  # Top 4 themes
                 row[t['theme']] = f"{int(t['percentage'])}%"
             
             comparison_data.append(row)
         
         if comparison_data:
             comparison_df = pl.DataFrame(comparison_data)
-            st.dataframe(comparison_df.to_pandas(), use_container_width=True, hide_index=True)
+            st.dataframe(comparison_df, use_container_width=True, hide_index=True)
     
     st.divider()
     
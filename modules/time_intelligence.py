@@ -5,22 +5,34 @@ Weekly trends with WoW analysis and anomaly detection
 
 import streamlit as st
 import polars as pl
-import pandas as pd
 from typing import Dict, Any
-import sys
-import os
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import COLORS
 from utils.visualizations import ChartBuilder
 from utils.data_processor import DataProcessor
 
 
-@st.cache_data
-def get_cached_weekly_aggregation(df: pl.DataFrame):
-     # Helper to prevent recalculation on every rerun if data hasn't changed
-    processor = DataProcessor(df)
-    return processor.get_weekly_aggregation()
+@st.cache_data(show_spinner=False, max_entries=4)
+def get_cached_weekly_aggregation(_df: pl.DataFrame, df_key: str) -> pl.DataFrame:
+    """Weekly volumes with WoW changes, computed once per loaded frame."""
+    return DataProcessor(_df).get_weekly_aggregation()
+
+
+def _thousands(expr: pl.Expr) -> pl.Expr:
+    """Format an integer expression with thousands separators, like f"{x:,}" (up to 999,999,999)."""
+    n = expr.cast(pl.Int64).abs()
+    groups = [(n // 1_000_000), (n // 1_000) % 1_000, n % 1_000]
+    
+    def zfill(e: pl.Expr) -> pl.Expr:
+        return e.cast(pl.Utf8).str.zfill(3)
+    
+    digits = (
+        pl.when(n >= 1_000_000).then(pl.format("{},{},{}", groups[0], zfill(groups[1]), zfill(groups[2])))
+        .when(n >= 1_000).then(pl.format("{},{}", groups[1], zfill(groups[2])))
+        .otherwise(n.cast(pl.Utf8))
+    )
+    return pl.when(expr < 0).then(pl.lit('-') + digits).otherwise(digits)
+
 
 def render_time_intelligence(df: pl.DataFrame, config: Dict[str, Any]):
     """Render the Time Intelligence module."""
@@ -28,10 +40,9 @@ def render_time_intelligence(df: pl.DataFrame, config: Dict[str, Any]):
     
     st.markdown(section_header("Time Intelligence", "clock", "Weekly trends with week-over-week analysis"), unsafe_allow_html=True)
     
-    # Use cached aggregation if possible, or just call directly (Streamlit caching requires hashable args, df is not hashable by default easily without config)
-    # For now, just call directly as it's fast enough
-    processor = DataProcessor(df)
-    weekly_df = processor.get_weekly_aggregation()
+    # The frame itself is not hashed; df_key identifies it, so reruns reuse the aggregation
+    df_key = config.get('df_key') or str(df.hash_rows().sum())
+    weekly_df = get_cached_weekly_aggregation(df, df_key)
     
     if len(weekly_df) == 0:
         st.markdown(warning_card("Date Parsing Error", "Unable to extract weekly data. Ensure your date column is valid."), unsafe_allow_html=True)
@@ -42,12 +53,20 @@ def render_time_intelligence(df: pl.DataFrame, config: Dict[str, Any]):
         (pl.col('year').cast(pl.Utf8) + '-W' + pl.col('week').cast(pl.Utf8).str.pad_start(2, '0')).alias('week_label')
     ])
     
-    # Summary metrics
-    avg_volume = weekly_df['volume'].mean()
-    max_volume = weekly_df['volume'].max()
-    min_volume = weekly_df['volume'].min()
-    spike_weeks = len(weekly_df.filter(pl.col('trend') == 'SPIKE'))
-    total_weeks = len(weekly_df)
+    # Summary metrics and volatility inputs in a single select
+    stats = weekly_df.select([
+        pl.col('volume').mean().alias('avg'),
+        pl.col('volume').max().alias('max'),
+        pl.col('volume').min().alias('min'),
+        pl.col('volume').std().alias('std'),
+        (pl.col('trend') == 'SPIKE').sum().alias('spikes'),
+        pl.len().alias('total'),
+    ]).row(0, named=True)
+    avg_volume = stats['avg']
+    max_volume = stats['max']
+    min_volume = stats['min']
+    spike_weeks = stats['spikes']
+    total_weeks = stats['total']
     
     # KPIs
     st.subheader("Key Performance Indicators")
@@ -77,7 +96,7 @@ def render_time_intelligence(df: pl.DataFrame, config: Dict[str, Any]):
         wow_pct = (wow_change / prev_vol * 100) if prev_vol > 0 else 0
         
         # Volatility Analysis
-        cv = weekly_df['volume'].std() / weekly_df['volume'].mean() if weekly_df['volume'].mean() > 0 else 0
+        cv = stats['std'] / avg_volume if avg_volume > 0 else 0
         stability = "Stable"
         if cv > 0.5: stability = "Highly Volatile"
         elif cv > 0.2: stability = "Variable"
@@ -136,24 +155,20 @@ def render_time_intelligence(df: pl.DataFrame, config: Dict[str, Any]):
     st.subheader("Weekly Breakdown")
     
     # Format for display
-    display_df = weekly_df.select([
-        'week_label',
-        'volume',
-        'wow_change',
-        'wow_pct',
-        'trend'
-    ]).to_pandas()
-    
-    display_df.columns = ['Week', 'Volume', 'WoW Change', 'WoW %', 'Trend']
-    
-    # Apply styling
     # Note: Streamlit dataframe styling is limited, creating string versions for display
-    display_df['Volume'] = display_df['Volume'].map(lambda x: f"{x:,}")
-    display_df['WoW Change'] = display_df['WoW Change'].map(
-        lambda x: f"+{x:,.0f}" if pd.notna(x) and x > 0 else (f"{x:,.0f}" if pd.notna(x) else '-')
-    )
-    display_df['WoW %'] = display_df['WoW %'].map(
-        lambda x: f"+{x:.1f}%" if pd.notna(x) and x > 0 else (f"{x:.1f}%" if pd.notna(x) else '-')
-    )
+    # (wow_pct is already rounded to one decimal, so its plain string form matches :.1f)
+    display_df = weekly_df.select([
+        pl.col('week_label').alias('Week'),
+        _thousands(pl.col('volume')).alias('Volume'),
+        pl.when(pl.col('wow_change').is_null()).then(pl.lit('-'))
+        .when(pl.col('wow_change') > 0).then(pl.lit('+') + _thousands(pl.col('wow_change')))
+        .otherwise(_thousands(pl.col('wow_change')))
+        .alias('WoW Change'),
+        pl.when(pl.col('wow_pct').is_null()).then(pl.lit('-'))
+        .when(pl.col('wow_pct') > 0).then(pl.format("+{}%", pl.col('wow_pct')))
+        .otherwise(pl.format("{}%", pl.col('wow_pct')))
+        .alias('WoW %'),
+        pl.col('trend').alias('Trend')
+    ])
     
     st.dataframe(display_df, use_container_width=True, hide_index=True)
@@ -0,0 +1,22 @@
+"""
+Tests for the Analysis-for-All distribution tab
+"""
+
+from streamlit.testing.v1 import AppTest
+
+
+def _distribution_app():
+    import datetime
+    import polars as pl
+    from modules.generic_analysis import render_distribution_analysis
+
+    df = pl.DataFrame({
+        'created': [datetime.date(2024, 1, 1), datetime.date(2024, 1, 2)],
+        'volume': [3, 5],
+    })
+    render_distribution_analysis(df, ['created'], ['volume'])
+
+
+def test_categorical_distribution_accepts_date_column():
+    at = AppTest.from_function(_distribution_app, default_timeout=60).run()
+    assert not at.exception
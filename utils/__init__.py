@@ -1,5 +1,22 @@
 """Utility modules for data processing, PII redaction, and visualizations."""
+import os
+import sys
+
+# Submodules import config as a top-level module; resolve the app root once
+# here rather than in every submodule
+_PKG_DIR = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_PKG_DIR)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
 from .pii_redactor import redact_pii, PIIRedactor
 from .data_processor import DataProcessor, load_data
 from .text_analytics import TextAnalyzer
-from .visualizations import ChartBuilder
+
+
+def __getattr__(name):
+    # ChartBuilder pulls in Plotly; import it on first access only
+    if name == 'ChartBuilder':
+        from .visualizations import ChartBuilder
+        return ChartBuilder
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
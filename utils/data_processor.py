@@ -8,11 +8,6 @@ from typing import Optional, Union, Dict, List, Any, Tuple
 import polars as pl
 import duckdb
 from datetime import datetime
-import sys
-import os
-
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import COLUMN_MAPPING, DYNAMIC_COLUMNS
 
@@ -31,7 +26,13 @@ class DataProcessor:
             df: Polars DataFrame to process
         """
         self.df = df
+        # df.columns builds a new list per access; membership checks use this set
+        self._columns = frozenset(df.columns)
         self._column_cache = {}
+        self._sky_mask = None
+        self._top_n_cache = {}
+        self._cardinality_cache = {}
+        self._country_rollup = None
         self._detect_columns()
     
     def _detect_columns(self):
@@ -53,6 +54,12 @@ class DataProcessor:
                         break
                 if name in self._column_cache:
                     break
+        
+        # Issue-level views prefer the sub-category and fall back to the category;
+        # resolved once here so every module reads the same 'issue' column
+        issue_col = self._column_cache.get('subcategory') or self._column_cache.get('category')
+        if issue_col:
+            self._column_cache['issue'] = issue_col
     
     def get_column(self, name: str) -> Optional[str]:
         """
@@ -76,7 +83,7 @@ class DataProcessor:
         return {
             'total_rows': len(self.df),
             'total_columns': len(self.df.columns),
-            'memory_usage_mb': round(self.df.estimated_size() / (1024 * 1024), 2)
+            'memory_usage_mb': round(self.df.estimated_size("mb"), 2)
         }
     
     def get_top_n(self, column: str, n: int = 10) -> pl.DataFrame:
@@ -90,17 +97,34 @@ class DataProcessor:
         Returns:
             DataFrame with value and count columns
         """
-        if column not in self.df.columns:
+        if column not in self._columns:
             return pl.DataFrame()
         
-        return (
-            self.df
-            .filter(pl.col(column).is_not_null())
-            .group_by(column)
-            .agg(pl.count().alias('count'))
-            .sort('count', descending=True)
-            .head(n)
-        )
+        # Single hash-count kernel instead of filter + group_by + agg + sort,
+        # kept per processor so a shared processor counts each column once
+        key = (column, n)
+        if key not in self._top_n_cache:
+            self._top_n_cache[key] = self.df.get_column(column).drop_nulls().value_counts(sort=True).head(n)
+        return self._top_n_cache[key]
+    
+    def get_cardinality(self, column: str) -> int:
+        """
+        Get the number of distinct values in a column (null counts as one).
+        
+        Cardinalities do not change with widget state, so each column is
+        hashed once per processor.
+        
+        Args:
+            column: Column name to count
+            
+        Returns:
+            Distinct value count, or 0 if the column is missing
+        """
+        if column not in self._columns:
+            return 0
+        if column not in self._cardinality_cache:
+            self._cardinality_cache[column] = self.df.get_column(column).n_unique()
+        return self._cardinality_cache[column]
     
     def get_distribution(self, column: str) -> pl.DataFrame:
         """
@@ -112,7 +136,7 @@ class DataProcessor:
         Returns:
             DataFrame with value, count, and percentage columns
         """
-        if column not in self.df.columns:
+        if column not in self._columns:
             return pl.DataFrame()
         
         total = len(self.df)
@@ -128,6 +152,65 @@ class DataProcessor:
             .sort('count', descending=True)
         )
     
+    def sky_mask(self) -> Optional[pl.Series]:
+        """
+        Boolean mask of rows where partner contains 'sky' (case-insensitive).
+        
+        Computed once per processor, so a shared processor lowercases and
+        scans the partner strings only once per frame.
+        
+        Returns:
+            Boolean Series aligned with the frame, or None without a partner column
+        """
+        if self._sky_mask is None:
+            partner_col = self.get_column('partner')
+            if not partner_col or partner_col not in self._columns:
+                return None
+            partner = self.df.get_column(partner_col)
+            if partner.dtype == pl.Categorical:
+                # Categorical partners (see optimize_dtypes) hold a handful of distinct
+                # names: match those once, then test the rows by category membership
+                names = partner.unique().drop_nulls()
+                sky_names = names.filter(names.cast(pl.Utf8).str.to_lowercase().str.contains('sky'))
+                self._sky_mask = partner.is_in(sky_names).fill_null(False).alias('is_sky')
+            else:
+                self._sky_mask = self.df.select(self._is_sky_expr(partner_col)).to_series()
+        return self._sky_mask
+    
+    def country_rollup(self) -> pl.DataFrame:
+        """
+        Case volume and Sky volume per country and issue, aggregated once.
+        
+        Country views answer a market selection from this small frame instead
+        of rescanning every row; null countries and issues keep their own groups.
+        
+        Returns:
+            DataFrame with the country column, the issue column (when present),
+            volume and sky_volume; empty without a country column
+        """
+        if self._country_rollup is None:
+            country_col = self.get_column('country')
+            if not country_col or country_col not in self._columns:
+                return pl.DataFrame()
+            issue_col = self.get_column('issue')
+            keys = [country_col]
+            if issue_col and issue_col in self._columns and issue_col != country_col:
+                keys.append(issue_col)
+            
+            sky_mask = self.sky_mask()
+            is_sky = pl.lit(sky_mask) if sky_mask is not None else pl.lit(False)
+            self._country_rollup = (
+                self.df.lazy()
+                .select(keys + [is_sky.alias('_is_sky')])
+                .group_by(keys)
+                .agg([
+                    pl.len().alias('volume'),
+                    pl.col('_is_sky').sum().alias('sky_volume'),
+                ])
+                .collect()
+            )
+        return self._country_rollup
+    
     def filter_sky_partners(self) -> pl.DataFrame:
         """
         Filter rows where partner contains 'sky' (case-insensitive).
@@ -135,18 +218,16 @@ class DataProcessor:
         Returns:
             Filtered DataFrame with Sky partner rows only
         """
-        partner_col = self.get_column('partner')
-        if not partner_col or partner_col not in self.df.columns:
+        mask = self.sky_mask()
+        if mask is None:
             return pl.DataFrame()
         
-        return self.df.filter(
-            pl.col(partner_col).is_not_null() & 
-            pl.col(partner_col).str.to_lowercase().str.contains('sky')
-        )
+        return self.df.filter(mask)
     
     def get_sky_partner_count(self) -> int:
         """Get count of Sky partner cases."""
-        return len(self.filter_sky_partners())
+        mask = self.sky_mask()
+        return int(mask.sum()) if mask is not None else 0
     
     def get_sky_partner_percentage(self) -> float:
         """Get percentage of cases involving Sky partners."""
@@ -155,6 +236,110 @@ class DataProcessor:
             return 0.0
         return round(self.get_sky_partner_count() / total * 100, 2)
     
+    @staticmethod
+    def _is_sky_expr(partner_col: str) -> pl.Expr:
+        """Whether the partner contains 'sky' (case-insensitive); null partners are False."""
+        return (
+            pl.col(partner_col).cast(pl.Utf8).str.to_lowercase().str.contains('sky')
+            .fill_null(False).alias('is_sky')
+        )
+    
+    @classmethod
+    def _sky_count_expr(cls, partner_col: str) -> pl.Expr:
+        """Count of rows whose partner contains 'sky', reduced in-kernel."""
+        return cls._is_sky_expr(partner_col).sum().alias('sky_count')
+    
+    def combined_summary(self, issue_col: Optional[str]) -> Dict[str, Any]:
+        """
+        Get the top issue and the Sky partner count in a single query.
+        
+        Args:
+            issue_col: Issue (sub-category) column name, or None
+            
+        Returns:
+            Dictionary with top_issue (value or None), top_issue_count and sky_count
+        """
+        partner_col = self.get_column('partner')
+        
+        exprs = []
+        if issue_col in self._columns:
+            exprs.append(pl.col(issue_col).drop_nulls().value_counts(sort=True).first().alias('top_issue'))
+        if partner_col and partner_col in self._columns:
+            exprs.append(self._sky_count_expr(partner_col))
+        
+        row = self.df.lazy().select(exprs).collect().row(0, named=True) if exprs else {}
+        # value_counts of an empty column has no first row
+        top = row.get('top_issue') or {}
+        
+        return {
+            'top_issue': top.get(issue_col),
+            'top_issue_count': top.get('count') or 0,
+            'sky_count': int(row.get('sky_count', 0)),
+        }
+    
+    def executive_bundle(self, country_col: Optional[str], cat_col: Optional[str],
+                         issue_col: Optional[str]) -> Dict[str, Any]:
+        """
+        Compute the executive dashboard aggregates in a single query.
+        
+        Args:
+            country_col: Country column name, or None
+            cat_col: Category column name, or None
+            issue_col: Issue (sub-category) column name, or None
+            
+        Returns:
+            Dictionary with total_rows, unique_markets, sky_count, sky_pct,
+            top_countries (top 10), top_issue (top 1) and distribution
+            (top 8 of category, else issue, with percentages)
+        """
+        columns = self._columns
+        country_col = country_col if country_col in columns else None
+        issue_col = issue_col if issue_col in columns else None
+        dist_col = cat_col if cat_col in columns else issue_col
+        partner_col = self.get_column('partner')
+        
+        def top_counts(column: str, n: int, alias: str) -> pl.Expr:
+            return pl.col(column).drop_nulls().value_counts(sort=True).head(n).implode().alias(alias)
+        
+        exprs = [pl.len().alias('total_rows')]
+        if country_col:
+            exprs += [pl.col(country_col).n_unique().alias('unique_markets'),
+                      top_counts(country_col, 10, 'top_countries')]
+        if issue_col:
+            exprs.append(top_counts(issue_col, 1, 'top_issue'))
+        if dist_col:
+            exprs.append(top_counts(dist_col, 8, 'distribution'))
+        if partner_col and partner_col in columns:
+            exprs.append(self._sky_count_expr(partner_col))
+        
+        # One pass over the frame for every aggregate
+        row = self.df.lazy().select(exprs).collect()
+        
+        def unpack(name: str) -> pl.DataFrame:
+            if name not in row.columns:
+                return pl.DataFrame()
+            # An empty list explodes to a single null row
+            return row.select(pl.col(name).explode()).unnest(name).drop_nulls('count')
+        
+        total = row['total_rows'][0]
+        sky_count = int(row['sky_count'][0]) if 'sky_count' in row.columns else 0
+        distribution = unpack('distribution')
+        if len(distribution) > 0:
+            distribution = distribution.with_columns([
+                (pl.col('count') / total * 100).round(2).alias('percentage')
+            ])
+        
+        return {
+            'total_rows': total,
+            'unique_markets': row['unique_markets'][0] if country_col else 0,
+            'sky_count': sky_count,
+            'sky_pct': round(sky_count / total * 100, 2) if total else 0.0,
+            'top_countries': unpack('top_countries'),
+            'top_issue': unpack('top_issue'),
+            'dist_col': dist_col,
+            'distribution': distribution,
+        }
+    
     def get_weekly_aggregation(self) -> pl.DataFrame:
         """
         Aggregate data by week with volume and WoW changes.
@@ -163,7 +348,7 @@ class DataProcessor:
             DataFrame with year, week, volume, wow_change, wow_pct columns
         """
         date_col = self.get_column('date')
-        if not date_col or date_col not in self.df.columns:
+        if not date_col or date_col not in self._columns:
             return pl.DataFrame()
         
         # Try to parse dates
@@ -248,7 +433,7 @@ class DataProcessor:
             DataFrame with _parsed_date column or None if parsing fails
         """
         # First check if already datetime type
-        if self.df[date_col].dtype in [pl.Date, pl.Datetime]:
+        if self.df.schema[date_col] in [pl.Date, pl.Datetime]:
             return self.df.with_columns([
                 pl.col(date_col).cast(pl.Date).alias('_parsed_date')
             ])
@@ -264,14 +449,15 @@ class DataProcessor:
             '%m/%d/%Y %H:%M:%S'
         ]
         
+        # Cast once; each format is tried on the bare column and only a hit is
+        # attached to the frame
+        text = self.df.get_column(date_col).cast(pl.Utf8)
         for fmt in formats:
             try:
-                df = self.df.with_columns([
-                    pl.col(date_col).str.strptime(pl.Date, format=fmt, strict=False).alias('_parsed_date')
-                ])
+                parsed = text.str.strptime(pl.Date, format=fmt, strict=False)
                 # Check if any dates were parsed
-                if df['_parsed_date'].null_count() < len(df):
-                    return df
+                if parsed.null_count() < len(parsed):
+                    return self.df.with_columns(parsed.alias('_parsed_date'))
             except:
                 continue
         
@@ -312,14 +498,14 @@ class DataProcessor:
         df = self.df
         
         # Apply filter if specified
-        if filter_col and filter_pattern and filter_col in df.columns:
+        if filter_col and filter_pattern and filter_col in self._columns:
             df = df.filter(
                 pl.col(filter_col).is_not_null() &
-                pl.col(filter_col).str.to_lowercase().str.contains(filter_pattern.lower())
+                pl.col(filter_col).cast(pl.Utf8).str.to_lowercase().str.contains(filter_pattern.lower())
             )
         
         # Validate columns exist
-        valid_cols = [c for c in group_cols if c in df.columns]
+        valid_cols = [c for c in group_cols if c in self._columns]
         if not valid_cols:
             return pl.DataFrame()
         
@@ -410,3 +596,38 @@ def get_top_value(df: pl.DataFrame, column: str) -> Tuple[str, int]:
         return ('N/A', 0)
     
     return (str(result[column][0]), int(result['count'][0]))
+
+
+def optimize_dtypes(df: pl.DataFrame, categorical_ratio: float = 0.02,
+                    dimension_columns: Tuple[str, ...] = ()) -> pl.DataFrame:
+    """
+    Shrink integer columns and encode low-cardinality strings as Categorical.
+    
+    Args:
+        df: Polars DataFrame as loaded from file
+        categorical_ratio: Max unique-to-rows ratio for a string column to become Categorical
+        dimension_columns: Group-by keys encoded as Categorical unless nearly unique
+        
+    Returns:
+        DataFrame with narrower dtypes
+    """
+    if len(df) == 0:
+        return df
+    
+    string_cols = [c for c, dtype in df.schema.items() if dtype == pl.Utf8]
+    cat_cols = []
+    if string_cols:
+        # Single pass for all string cardinalities
+        unique_counts = df.select([pl.col(c).n_unique() for c in string_cols]).row(0)
+        max_unique = len(df) * categorical_ratio
+        # Dimensions are grouped on repeatedly, so they pay off at far higher cardinality
+        max_dimension_unique = len(df) * 0.5
+        cat_cols = [
+            c for c, n in zip(string_cols, unique_counts)
+            if n <= (max_dimension_unique if c in dimension_columns else max_unique)
+        ]
+    
+    return df.with_columns(
+        [pl.col(pl.INTEGER_DTYPES).shrink_dtype()] +
+        [pl.col(c).cast(pl.Categorical) for c in cat_cols]
+    )
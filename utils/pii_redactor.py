@@ -91,33 +91,39 @@ class PIIRedactor:
             return text if text else ''
         
         result = text
+        for pattern, placeholder in self._active_patterns():
+            result = pattern.sub(placeholder, result)
         
-        # Redact emails
-        if self.redact_emails:
-            result = self.PATTERNS['EMAIL'].sub(self.PLACEHOLDERS['EMAIL'], result)
+        return result
+    
+    def _active_patterns(self) -> list:
+        """
+        Get the enabled patterns in redaction order.
         
-        # Redact phone numbers
+        Returns:
+            List of (compiled pattern, placeholder) tuples
+        """
+        rules = []
+        if self.redact_emails:
+            rules.append((self.PATTERNS['EMAIL'], self.PLACEHOLDERS['EMAIL']))
         if self.redact_phones:
-            result = self.PATTERNS['PHONE'].sub(self.PLACEHOLDERS['PHONE'], result)
-        
-        # Redact credit cards
+            rules.append((self.PATTERNS['PHONE'], self.PLACEHOLDERS['PHONE']))
         if self.redact_cards:
-            result = self.PATTERNS['CREDIT_CARD'].sub(self.PLACEHOLDERS['CREDIT_CARD'], result)
-        
-        # Redact IP addresses
+            rules.append((self.PATTERNS['CREDIT_CARD'], self.PLACEHOLDERS['CREDIT_CARD']))
         if self.redact_ips:
-            result = self.PATTERNS['IP_ADDRESS'].sub(self.PLACEHOLDERS['IP_ADDRESS'], result)
-        
-        # Redact URLs
+            rules.append((self.PATTERNS['IP_ADDRESS'], self.PLACEHOLDERS['IP_ADDRESS']))
         if self.redact_urls:
-            result = self.PATTERNS['URL'].sub(self.PLACEHOLDERS['URL'], result)
-        
-        # Redact names (using title patterns)
+            rules.append((self.PATTERNS['URL'], self.PLACEHOLDERS['URL']))
+        # Names are matched via title/greeting patterns
         if self.redact_names:
-            for pattern in self.NAME_PATTERNS:
-                result = pattern.sub(self.PLACEHOLDERS['NAME'], result)
-        
-        return result
+            rules.extend((pattern, self.PLACEHOLDERS['NAME']) for pattern in self.NAME_PATTERNS)
+        return rules
+    
+    @staticmethod
+    def _to_polars_regex(pattern: re.Pattern) -> str:
+        """Translate a compiled Python pattern to Polars (Rust regex) syntax."""
+        prefix = '(?i)' if pattern.flags & re.IGNORECASE else ''
+        return prefix + pattern.pattern
     
     def redact_dataframe(self, df: pl.DataFrame, columns: list) -> pl.DataFrame:
         """
@@ -130,17 +136,18 @@ class PIIRedactor:
         Returns:
             DataFrame with PII redacted from specified columns
         """
+        rules = [(self._to_polars_regex(p), placeholder) for p, placeholder in self._active_patterns()]
+        
+        # Native str.replace_all runs the regexes in Rust, no per-row Python calls
+        exprs = []
         for col in columns:
             if col in df.columns:
-                # Use map_elements for custom function application
-                df = df.with_columns([
-                    pl.col(col).map_elements(
-                        self.redact_text,
-                        return_dtype=pl.Utf8
-                    ).alias(col)
-                ])
+                expr = pl.col(col).cast(pl.Utf8)
+                for pattern, placeholder in rules:
+                    expr = expr.str.replace_all(pattern, placeholder)
+                exprs.append(expr.alias(col))
         
-        return df
+        return df.with_columns(exprs) if exprs else df
     
     def get_stats(self, text: str) -> dict:
         """
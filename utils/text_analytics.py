@@ -6,11 +6,7 @@ No ML dependencies - pure keyword matching with weighted scoring
 import re
 from typing import Dict, Tuple, List, Optional
 import polars as pl
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import KEYWORDS
+from config import KEYWORDS, KEYWORD_ROWS
 
 
 class TextAnalyzer:
@@ -28,6 +24,14 @@ class TextAnalyzer:
     
     def __init__(self, keywords: Optional[Dict] = None):
         self.keywords = keywords or KEYWORDS
+        if self.keywords is KEYWORDS:
+            self.keyword_rows = KEYWORD_ROWS
+        else:
+            self.keyword_rows = tuple(
+                (keyword, theme, weight)
+                for theme, keyword_dict in self.keywords.items()
+                for keyword, weight in keyword_dict.items()
+            )
     
     def clean_text(self, text: Optional[str]) -> str:
         if text is None or not isinstance(text, str):
@@ -43,11 +47,10 @@ class TextAnalyzer:
         if not cleaned:
             return ('Unknown', 0)
         
-        scores = {theme: 0 for theme in self.keywords.keys()}
-        for theme, keyword_dict in self.keywords.items():
-            for keyword, weight in keyword_dict.items():
-                if keyword in cleaned:
-                    scores[theme] += weight
+        scores = dict.fromkeys(self.keywords, 0)
+        for keyword, theme, weight in self.keyword_rows:
+            if keyword in cleaned:
+                scores[theme] += weight
         
         max_score = max(scores.values())
         if max_score == 0:
@@ -56,6 +59,41 @@ class TextAnalyzer:
         dominant_theme = max(scores.items(), key=lambda x: x[1])
         return dominant_theme
     
+    def _clean_expr(self, column: str) -> pl.Expr:
+        """Column-wide equivalent of clean_text."""
+        expr = pl.col(column).cast(pl.Utf8).str.to_lowercase()
+        # Rust regex takes case-insensitivity as an inline flag
+        for pattern in [self.EMAIL_PATTERN] + self.CLEANUP_PATTERNS:
+            expr = expr.str.replace_all(f'(?i){pattern.pattern}', ' ')
+        return expr.str.replace_all(r'\s+', ' ').str.strip_chars()
+    
+    def _score_themes(self, df: pl.DataFrame, column: str) -> pl.DataFrame:
+        """Add theme and theme_score columns matching categorize_text on cleaned text."""
+        text = pl.col(column)
+        themes = list(self.keywords.keys())
+        score_cols = [f'_score_{idx}' for idx in range(len(themes))]
+        
+        df = df.with_columns([
+            pl.sum_horizontal([
+                text.str.contains(keyword, literal=True).cast(pl.Int64) * weight
+                for keyword, weight in keyword_dict.items()
+            ]).alias(score_col)
+            for score_col, keyword_dict in zip(score_cols, self.keywords.values())
+        ]).with_columns(pl.max_horizontal(score_cols).alias('_top_score'))
+        
+        # First theme reaching the top score wins ties, like max() over the dict
+        top = pl.col('_top_score')
+        theme = pl.when(pl.col(score_cols[0]) == top).then(pl.lit(themes[0]))
+        for score_col, name in zip(score_cols[1:], themes[1:]):
+            theme = theme.when(pl.col(score_col) == top).then(pl.lit(name))
+        
+        # Null text stays null, as map_elements skipped it
+        return df.with_columns([
+            pl.when(text.is_null()).then(None)
+            .when(top > 0).then(theme).otherwise(pl.lit('Unknown')).alias('theme'),
+            pl.when(text.is_null()).then(None).otherwise(top).alias('theme_score'),
+        ]).drop(score_cols + ['_top_score'])
+    
     def analyze_dataframe(self, df: pl.DataFrame, text_col: str,
                           fallback_col: Optional[str] = None) -> pl.DataFrame:
         if fallback_col and fallback_col in df.columns:
@@ -69,16 +107,9 @@ class TextAnalyzer:
         else:
             analysis_col = text_col
         
-        def categorize_row(text):
-            return self.categorize_text(text)[0]
-        
-        def score_row(text):
-            return self.categorize_text(text)[1]
-        
-        df = df.with_columns([
-            pl.col(analysis_col).map_elements(categorize_row, return_dtype=pl.Utf8).alias('theme'),
-            pl.col(analysis_col).map_elements(score_row, return_dtype=pl.Int64).alias('theme_score')
-        ])
+        # Keyword scoring runs as literal substring scans in Polars, not per-row Python
+        df = df.with_columns(self._clean_expr(analysis_col).alias('_cleaned_text'))
+        df = self._score_themes(df, '_cleaned_text').drop('_cleaned_text')
         
         if '_combined_text' in df.columns:
             df = df.drop('_combined_text')
@@ -146,7 +177,7 @@ class TextAnalyzer:
             f"({top_theme[1]:,} mentions)."
         )
         
-        top_3_pct = sum([row[2] for row in dist.head(3).iter_rows()])
+        top_3_pct = dist.get_column('percentage').head(3).sum()
         concentration = 'HIGH' if top_3_pct > 70 else ('MODERATE' if top_3_pct > 50 else 'DISTRIBUTED')
         insights['concentration'] = f"{concentration} concentration ({top_3_pct:.1f}% in top 3 themes)."
         
@@ -167,3 +198,17 @@ def analyze_themes(df: pl.DataFrame, text_col: str,
                    fallback_col: Optional[str] = None) -> pl.DataFrame:
     analyzer = TextAnalyzer()
     return analyzer.analyze_dataframe(df, text_col, fallback_col)
+
+
+def keyword_dispatch(rules: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> 're.Pattern':
+    """
+    Compile ordered (key, keywords) rules into one case-insensitive regex.
+    
+    Each rule is a lookahead anchored at the start of the text, so .match()
+    picks the first rule with any keyword anywhere (not the leftmost keyword)
+    and .lastgroup names it. No match means no rule applies.
+    """
+    return re.compile(
+        '|'.join(f'(?=.*?(?P<{key}>{"|".join(map(re.escape, keywords))}))' for key, keywords in rules),
+        re.IGNORECASE | re.DOTALL
+    )
@@ -7,10 +7,6 @@ from typing import Optional, List
 import polars as pl
 import plotly.express as px
 import plotly.graph_objects as go
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
     from config import COLORS, CHART_COLORS